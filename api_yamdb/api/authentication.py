@@ -0,0 +1,131 @@
+"""JWT-аутентификация с кэшированием проверенных токенов и пользователей.
+
+Проверенный токен хранится в LRU-кэше процесса по хешу строки токена
+до истечения его срока, поэтому подпись проверяется один раз. Пользователь
+берётся из общего кэша Django с коротким TTL; запись удаляется сигналом
+при любом изменении или удалении пользователя, так что смена роли или
+блокировка действуют со следующего запроса. В кэше хранятся только поля
+для проверки прав, без хеша пароля и личных данных; остальные поля
+пользователя догружаются из базы при первом обращении.
+"""
+import time
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import LRUCache
+
+DEFAULTS = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'default',
+    'TOKEN_MAX_ENTRIES': 10000,
+    'USER_TTL': 60,
+}
+# Поля пользователя, которые хранятся в общем кэше.
+USER_CACHE_FIELDS = (
+    'id', 'username', 'role', 'is_active', 'is_staff', 'is_superuser'
+)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'AUTH_CACHE', {})}
+
+
+def user_cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_cached_users(user_ids):
+    """Сбрасывает кэш пользователей, изменённых в обход сигналов."""
+    caches[get_config()['CACHE_ALIAS']].delete_many(
+        [user_cache_key(user_id) for user_id in user_ids]
+    )
+
+
+def forget_cached_user(sender, instance, **kwargs):
+    forget_cached_users([instance.pk])
+
+
+class TokenCache:
+    """LRU-кэш проверенных токенов процесса."""
+
+    def __init__(self):
+        self.local = None
+
+    def get_local(self, config):
+        if self.local is None:
+            self.local = LRUCache(
+                config['TOKEN_MAX_ENTRIES'],
+                api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+            )
+        return self.local
+
+    def get(self, key):
+        entry = self.get_local(get_config()).get(key)
+        if entry is None:
+            return None
+        expires, token = entry
+        if expires <= time.time():
+            return None
+        return token
+
+    def set(self, key, token):
+        self.get_local(get_config()).set(key, (token['exp'], token))
+
+    def clear(self):
+        self.local = None
+
+
+token_cache = TokenCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication с кэшем проверенных токенов и пользователей."""
+
+    def get_validated_token(self, raw_token):
+        if not get_config()['ENABLED']:
+            return super().get_validated_token(raw_token)
+        key = sha256(raw_token).hexdigest()
+        token = token_cache.get(key)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            token_cache.set(key, token)
+        return token
+
+    def get_user(self, validated_token):
+        config = get_config()
+        if not config['ENABLED']:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification'
+            )
+        cache = caches[config['CACHE_ALIAS']]
+        key = user_cache_key(user_id)
+        fields = cache.get(key)
+        if fields is not None:
+            return self.rebuild_user(fields)
+        # Проверяет существование и активность пользователя.
+        user = super().get_user(validated_token)
+        cache.set(key, {
+            name: getattr(user, name) for name in USER_CACHE_FIELDS
+        }, config['USER_TTL'])
+        return user
+
+    def rebuild_user(self, fields):
+        """Пользователь из кэша; прочие поля загружаются отложенно."""
+        names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in fields
+        ]
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            names, [fields[name] for name in names]
+        )
@@ -0,0 +1,308 @@
+"""Кэш ответов и условные GET-запросы.
+
+Сигнатура ответа складывается из пути, нормализованной строки запроса,
+формата ответа и версий данных, от которых зависит выдача. Версии
+хранятся в общем кэше Django и меняются сигналами при любом изменении
+модели, поэтому устаревшие записи просто перестают находиться и
+вытесняются по LRU или TTL. Версия модели может относиться ко всей
+таблице или к строкам одного родителя, например к отзывам одного
+произведения. Значение версии - время изменения в наносекундах, из
+него же берётся заголовок Last-Modified.
+"""
+import threading
+import time
+from collections import OrderedDict
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+DEFAULTS = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'default',
+    'TTL': 60,
+    'MAX_ENTRIES': 1024,
+    'COUNT_TTL': 300,
+}
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'RESPONSE_CACHE', {})}
+
+
+class LRUCache:
+    """Потокобезопасный LRU-кэш процесса с ограничением размера и TTL."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+EPOCH_KEY = 'model-version:epoch'
+
+
+def version_key(model, **scope):
+    """Ключ версии модели целиком или строк с заданным родителем."""
+    key = f'model-version:{model._meta.label_lower}'
+    for field, value in sorted(scope.items()):
+        key += f':{field}={value}'
+    return key
+
+
+def get_versions(keys):
+    """Возвращает версии по ключам одним обращением к общему кэшу.
+
+    Первой в списке идёт версия, которая меняется после массовых
+    изменений в обход сигналов и сбрасывает все остальные.
+    """
+    cache = caches[get_config()['CACHE_ALIAS']]
+    keys = [EPOCH_KEY, *keys]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Время изменения неизвестно: считаем, что данные изменились
+            # сейчас, и не повторяем версии до вытеснения ключа.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*keys):
+    cache = caches[get_config()['CACHE_ALIAS']]
+    versions = cache.get_many(keys)
+    cache.set_many({
+        # Версия растёт, даже если часы сервера отстали.
+        key: max(time.time_ns(), versions.get(key, 0) + 1)
+        for key in keys
+    }, timeout=None)
+
+
+def cached_count(queryset, versions):
+    """Возвращает число строк выборки, запоминая его в общем кэше.
+
+    Ключ складывается из SQL-запроса и версий данных, от которых
+    зависит выборка, поэтому после изменения данных счётчик
+    пересчитывается.
+    """
+    config = get_config()
+    if not config['ENABLED']:
+        return queryset.count()
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    raw_key = f'{sql}|{params}|{".".join(map(str, versions))}'
+    key = f'count:{md5(raw_key.encode("utf-8")).hexdigest()}'
+    cache = caches[config['CACHE_ALIAS']]
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, config['COUNT_TTL'])
+    return count
+
+
+class PendingBump:
+    """Откладывает смену версий до фиксации транзакции.
+
+    Каскадное удаление шлёт сигнал на каждую строку; в пределах
+    транзакции каждая версия меняется один раз.
+    """
+
+    def __init__(self):
+        self.keys = set()
+
+    def __call__(self):
+        bump_versions(*self.keys)
+
+
+def pending_callback(callback_class):
+    """Общий для текущей транзакции обработчик on_commit этого класса.
+
+    Вне транзакции возвращает новый обработчик, который вызывающий
+    запускает сам.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return callback_class()
+    for _, callback in connection.run_on_commit:
+        if isinstance(callback, callback_class):
+            return callback
+    callback = callback_class()
+    transaction.on_commit(callback)
+    return callback
+
+
+def schedule_bump(*keys):
+    if not transaction.get_connection().in_atomic_block:
+        bump_versions(*keys)
+        return
+    pending_callback(PendingBump).keys.update(keys)
+
+
+class ResponseCache:
+    """Двухуровневый кэш: LRU процесса поверх общего кэша Django."""
+
+    def __init__(self):
+        self.local = None
+
+    def get_local(self, config):
+        if self.local is None:
+            self.local = LRUCache(config['MAX_ENTRIES'], config['TTL'])
+        return self.local
+
+    def get(self, key):
+        config = get_config()
+        local = self.get_local(config)
+        value = local.get(key)
+        if value is None:
+            value = caches[config['CACHE_ALIAS']].get(key)
+            if value is not None:
+                local.set(key, value)
+        return value
+
+    def set(self, key, value):
+        config = get_config()
+        self.get_local(config).set(key, value)
+        caches[config['CACHE_ALIAS']].set(key, value, config['TTL'])
+
+    def clear(self):
+        self.local = None
+
+
+response_cache = ResponseCache()
+
+
+class AnonymousCacheMixin:
+    """Кэширует ответы list для анонимных пользователей.
+
+    Представление перечисляет в cache_models модели, изменение которых
+    должно сбрасывать его кэш, или переопределяет get_cache_dependencies.
+    Другие действия кэшируются обёрткой
+    self.cached(super().<action>, request, ...).
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def get_cache_dependencies(self):
+        return [version_key(model) for model in self.cache_models]
+
+    def get_response_versions(self):
+        if getattr(self, 'response_versions', None) is None:
+            self.response_versions = get_versions(
+                self.get_cache_dependencies()
+            )
+        return self.response_versions
+
+    def get_response_signature(self, request):
+        query = urlencode(sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+        ))
+        versions = '.'.join(map(str, self.get_response_versions()))
+        raw_key = (
+            f'{request.get_host()}{request.path}?{query}'
+            f'|{request.accepted_renderer.format}|{versions}'
+        )
+        return md5(raw_key.encode('utf-8')).hexdigest()
+
+    def get_cache_key(self, request):
+        if (not get_config()['ENABLED']
+                or request.method not in CACHEABLE_METHODS
+                or request.user.is_authenticated):
+            return None
+        return f'response:{self.get_response_signature(request)}'
+
+    def cached(self, handler, request, *args, **kwargs):
+        self.response_cache_key = self.get_cache_key(request)
+        if self.response_cache_key is not None:
+            cached = response_cache.get(self.response_cache_key)
+            if cached is not None:
+                self.response_cache_key = None
+                content_type, content = cached
+                return HttpResponse(content, content_type=content_type)
+        return handler(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        key = getattr(self, 'response_cache_key', None)
+        if (key is not None and isinstance(response, Response)
+                and response.status_code == 200):
+            response.render()
+            response_cache.set(
+                key, (response['Content-Type'], response.content)
+            )
+        return response
+
+
+class ConditionalGetMixin(AnonymousCacheMixin):
+    """Добавляет к list и retrieve заголовки ETag и Last-Modified.
+
+    Валидаторы вычисляются из версий данных, поэтому на запросы с
+    совпавшими If-None-Match или If-Modified-Since ответ 304 отдаётся
+    без обращения к базе. Ответы кэшируются как в AnonymousCacheMixin.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+    def cached(self, handler, request, *args, **kwargs):
+        self.validators = None
+        if request.method in CACHEABLE_METHODS:
+            self.validators = (
+                quote_etag(self.get_response_signature(request)),
+                max(self.get_response_versions()) // 10 ** 9,
+            )
+            response = get_conditional_response(request, *self.validators)
+            if response is not None:
+                return response
+        return super().cached(handler, request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        validators = getattr(self, 'validators', None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,123 @@
+"""Разреженные наборы полей: параметры запроса fields= и omit=.
+
+GET /api/v1/titles/?fields=id,name,rating оставляет в ответе только
+перечисленные поля, ?omit=description убирает указанные. Запрос к базе
+сужается вместе с выдачей: не нужные столбцы откладываются через
+only(), а связи невыводимых полей не присоединяются и не подгружаются.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def split_param(request, name):
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def lookup_root(lookup):
+    if isinstance(lookup, Prefetch):
+        lookup = lookup.prefetch_through
+    return lookup.split('__')[0]
+
+
+def narrow_queryset(queryset, sources):
+    """Оставляет в запросе только столбцы и связи для полей sources."""
+    names = {source.split('.')[0] for source in sources}
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        kept = [lookup for lookup in select_related if lookup in names]
+        queryset = queryset.select_related(None)
+        if kept:
+            queryset = queryset.select_related(*kept)
+    prefetches = queryset._prefetch_related_lookups
+    if prefetches:
+        queryset = queryset.prefetch_related(None).prefetch_related(*(
+            lookup for lookup in prefetches if lookup_root(lookup) in names
+        ))
+
+    opts = queryset.model._meta
+    # Поля сортировки нужны пагинации для построения курсора.
+    ordering = queryset.query.order_by or opts.ordering
+    columns = {
+        name.lstrip('-') for name in ordering
+        if isinstance(name, str) and '__' not in name
+        and name.lstrip('-') != 'pk'
+    }
+    for name in names:
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            # Вычисляемое поле: какие столбцы ему нужны, неизвестно.
+            return queryset
+        if field.concrete:
+            columns.add(name)
+    return queryset.only(*columns)
+
+
+class FieldsetSerializerMixin:
+    """Оставляет в сериализаторе только поля из аргумента fields."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    """Применяет fields= и omit= к выдаче и запросу GET-запросов.
+
+    Сериализатор представления должен наследовать
+    FieldsetSerializerMixin.
+    """
+
+    def get_fieldset(self):
+        """Возвращает выводимые поля сериализатора или None."""
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = self.parse_fieldset()
+        return self._fieldset
+
+    def parse_fieldset(self):
+        request = self.request
+        if request.method not in SAFE_METHODS:
+            return None
+        fields = split_param(request, FIELDS_PARAM)
+        omit = split_param(request, OMIT_PARAM) or ()
+        if fields is None and not omit:
+            return None
+        available = self.get_serializer_class()(
+            context=self.get_serializer_context()
+        ).fields
+        unknown = (set(fields or ()) | set(omit)) - set(available)
+        if unknown:
+            raise ValidationError({
+                FIELDS_PARAM: f'Неизвестные поля: '
+                              f'{", ".join(sorted(unknown))}.'
+            })
+        return {
+            name: field for name, field in available.items()
+            if (fields is None or name in fields) and name not in omit
+        }
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            kwargs['fields'] = tuple(fieldset)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return queryset
+        return narrow_queryset(
+            queryset, [field.source for field in fieldset.values()]
+        )
@@ -1,12 +1,74 @@
-from django_filters.rest_framework import CharFilter, FilterSet
-from titles.models import Title
+from django.db.models import Exists, OuterRef
+from django_filters.rest_framework import (BaseInFilter, CharFilter,
+                                           ChoiceFilter, FilterSet,
+                                           NumberFilter)
+from titles.models import Category, Genre, GenreTitle, Title
+from titles.search import search_titles
+
+GENRE_MATCH_ANY = 'any'
+GENRE_MATCH_ALL = 'all'
+
+
+class CharInFilter(BaseInFilter, CharFilter):
+    """Принимает несколько значений через запятую: ?genre=a,b,c."""
 
 
 class TitleFilter(FilterSet):
-    name = CharFilter(field_name='name', lookup_expr='icontains')
-    category = CharFilter(field_name='category__slug')
-    genre = CharFilter(field_name='genre__slug')
+    """Фильтры списка произведений.
+
+    Жанры и категории проверяются подзапросами EXISTS и IN по индексам
+    GenreTitle и Category, без JOIN во внешнем запросе, поэтому строки
+    не дублируются и DISTINCT не нужен.
+    """
+
+    name = CharFilter(method='filter_name')
+    category = CharInFilter(method='filter_category')
+    genre = CharInFilter(method='filter_genre')
+    genre_match = ChoiceFilter(
+        choices=((GENRE_MATCH_ANY, 'Любой из жанров'),
+                 (GENRE_MATCH_ALL, 'Все жанры')),
+        method='filter_genre_match'
+    )
+    year_min = NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = NumberFilter(field_name='year', lookup_expr='lte')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'category', 'genre', 'year',)
+        fields = (
+            'name', 'category', 'genre', 'genre_match', 'year', 'year_min',
+            'year_max', 'search'
+        )
+
+    def filter_name(self, queryset, name, value):
+        return search_titles(queryset, value, column='name', ranked=False)
+
+    def filter_category(self, queryset, name, slugs):
+        return queryset.filter(category_id__in=(
+            Category.objects.filter(slug__in=slugs).values('id')
+        ))
+
+    def filter_genre(self, queryset, name, slugs):
+        """Оставляет произведения с любым или со всеми жанрами из slugs."""
+        slugs = list(dict.fromkeys(slugs))
+        if self.form.cleaned_data.get('genre_match') == GENRE_MATCH_ALL:
+            groups = [[slug] for slug in slugs]
+        else:
+            groups = [slugs]
+        for group in groups:
+            queryset = queryset.filter(Exists(
+                GenreTitle.objects.filter(
+                    genre_id__in=Genre.objects.filter(
+                        slug__in=group
+                    ).values('id'),
+                    title_id=OuterRef('pk')
+                )
+            ))
+        return queryset
+
+    def filter_genre_match(self, queryset, name, value):
+        # Режим учитывается в filter_genre.
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,230 @@
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination,
+                                       PageNumberPagination,
+                                       remove_query_param,
+                                       replace_query_param)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .cache import cached_count
+
+
+class SeekPagination(BasePagination):
+    """Курсорная пагинация по составному ключу сортировки.
+
+    Вместо OFFSET страница выбирается условием «строго после ключа
+    последней записи», поэтому глубокие страницы стоят столько же,
+    сколько первая, а вставки новых записей не сдвигают выдачу.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+    page_size = api_settings.PAGE_SIZE
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        reverse, position = self.decode_cursor(request, queryset.model)
+        self.has_cursor = position is not None
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self._invert(field) for field in ordering)
+        if self.has_cursor:
+            queryset = queryset.filter(self._seek(ordering, position))
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = self.has_cursor, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(True, self.page[0])
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            reverse, position = json.loads(
+                b64decode(encoded.encode('ascii')).decode('utf-8')
+            )
+            if (not isinstance(position, list)
+                    or len(position) != len(self.ordering)):
+                raise ValueError('cursor length')
+            position = [
+                self.parse_value(model, field, value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return bool(reverse), position
+
+    @staticmethod
+    def parse_value(model, field, value):
+        """Приводит значение курсора к типу поля сортировки."""
+        if value is None or isinstance(value, (list, dict)):
+            raise ValueError('cursor value')
+        name = field.lstrip('-')
+        opts = model._meta
+        model_field = opts.pk if name == 'pk' else opts.get_field(name)
+        value = model_field.to_python(value)
+        if value is None:
+            raise ValueError('cursor value')
+        return value
+
+    def encode_cursor(self, reverse, instance):
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            position.append(value)
+        encoded = b64encode(
+            json.dumps([reverse, position]).encode('utf-8')
+        ).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _seek(ordering, position):
+        """Строит условие (a, b) > (x, y) с учётом направлений сортировки."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+
+class CountedPaginator(Paginator):
+    """Paginator, получающий число объектов из count_source."""
+
+    def __init__(self, object_list, per_page, count_source, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_source = count_source
+
+    @cached_property
+    def count(self):
+        return self.count_source()
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """Постраничная пагинация с переключением в курсорный режим.
+
+    Курсорный режим включается параметром ``?pagination=cursor``
+    и сортирует выдачу по ``cursor_ordering`` представления.
+
+    Число объектов для поля count берётся из get_known_count()
+    представления, если оно его знает, иначе из кэша по версиям данных
+    (get_response_versions()). С ``?count=false`` число не считается
+    вовсе: наличие следующей страницы определяется по лишней строке.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    count_query_param = 'count'
+    skip_count_values = ('false', '0')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.seek_paginator = None
+        self.uncounted_page = None
+        params = request.query_params
+        if (params.get(self.mode_query_param) == self.cursor_mode
+                or SeekPagination.cursor_query_param in params):
+            self.seek_paginator = SeekPagination(view.cursor_ordering)
+            return self.seek_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        if params.get(self.count_query_param) in self.skip_count_values:
+            return self.paginate_without_count(queryset, request)
+        self.django_paginator_class = partial(
+            CountedPaginator,
+            count_source=lambda: self.get_count(queryset, view)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset, view):
+        get_known_count = getattr(view, 'get_known_count', None)
+        if get_known_count is not None:
+            count = get_known_count()
+            if count is not None:
+                return count
+        get_versions = getattr(view, 'get_response_versions', None)
+        if get_versions is not None:
+            return cached_count(queryset, get_versions())
+        return queryset.count()
+
+    def paginate_without_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise NotFound(self.invalid_page_message)
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.request = request
+        self.uncounted_page = (number, len(rows) > page_size)
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.seek_paginator is not None:
+            return self.seek_paginator.get_paginated_response(data)
+        if self.uncounted_page is not None:
+            return Response(OrderedDict([
+                ('next', self.get_uncounted_link(1)),
+                ('previous', self.get_uncounted_link(-1)),
+                ('results', data)
+            ]))
+        return super().get_paginated_response(data)
+
+    def get_uncounted_link(self, step):
+        number, has_next = self.uncounted_page
+        if (step > 0 and not has_next) or number + step < 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if number + step == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, number + step)
@@ -16,6 +16,6 @@ class IsAuthorModeratorAdminOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         return (request.method in SAFE_METHODS
                 or (request.user.is_authenticated
-                    and (obj.author == request.user
+                    and (obj.author_id == request.user.id
                          or request.user.is_moderator
                          or request.user.is_admin)))
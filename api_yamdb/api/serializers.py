@@ -1,18 +1,34 @@
 from api.validators import validate_score_range, validate_year
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.core.validators import RegexValidator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from reviews.models import Comment, Review
-from titles.models import Category, Genre, Title
+from titles.models import Category, Genre, GenreTitle, Title
 from users.models import User, UserRole
+from users.services import queue_email
 
 from api_yamdb import constants
+from .fieldsets import FieldsetSerializerMixin
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class AuthorUsernameMixin:
+    """Читает имя автора из author_username, если столбец включён."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if settings.DENORMALIZED_AUTHOR_USERNAME:
+            fields['author'] = serializers.CharField(
+                source='author_username', read_only=True
+            )
+        return fields
+
+
+class ReviewSerializer(AuthorUsernameMixin, FieldsetSerializerMixin,
+                       serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
@@ -23,33 +39,13 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
-
-    def validate(self, data):
-        request = self.context['request']
-        author = request.user
-
-        if request.method == 'POST':
-            title_id = (
-                self.context['request'].parser_context['kwargs']
-                .get('title_id')
-            )
-            if title_id is None:
-                raise serializers.ValidationError(
-                    'Не удалось определить Title ID из URL.'
-                )
-
-            if Review.objects.filter(
-                author=author, title_id=title_id
-            ).exists():
-                raise serializers.ValidationError(
-                    ('Вы уже оставили отзыв на это произведение.')
-                )
-
-        return data
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count'
+        )
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(AuthorUsernameMixin, FieldsetSerializerMixin,
+                        serializers.ModelSerializer):
     """Сериализации вложенных комментариев к отзыву."""
 
     author = serializers.SlugRelatedField(
@@ -59,7 +55,25 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        exclude = ('review',)
+        exclude = ('review', 'author_username')
+
+
+def check_signup_conflicts(data, users):
+    """Проверяет, что email и username не заняты разными пользователями."""
+    if any(
+        user.email == data['email'] and user.username != data['username']
+        for user in users
+    ):
+        raise serializers.ValidationError({
+            'email': 'Этот email уже используется для другого аккаунта!'
+        })
+    if any(
+        user.username == data['username'] and user.email != data['email']
+        for user in users
+    ):
+        raise serializers.ValidationError({
+            'username': 'Этот username уже занят другим пользователем!'
+        })
 
 
 class SignUpSerializer(serializers.Serializer):
@@ -84,34 +98,43 @@ class SignUpSerializer(serializers.Serializer):
         return value
 
     def validate(self, data):
-        email = data['email']
-        username = data['username']
-        email_owner = User.objects.filter(email=email).first()
-        username_owner = User.objects.filter(username=username).first()
-
-        if email_owner and email_owner.username != username:
-            raise serializers.ValidationError({
-                'email': 'Этот email уже используется для другого аккаунта!'
-            })
-        if username_owner and username_owner.email != email:
-            raise serializers.ValidationError({
-                'username': 'Этот username уже занят другим пользователем!'
-            })
+        # Владельцы email и username ищутся одним запросом.
+        users = list(User.objects.filter(
+            Q(email=data['email']) | Q(username=data['username'])
+        )[:2])
+        check_signup_conflicts(data, users)
+        self.existing_user = users[0] if users else None
         return data
 
     def create(self, validated_data):
-        user, _ = User.objects.get_or_create(**validated_data)
-        confirmation_code = default_token_generator.make_token(user)
-
-        send_mail(
-            subject='Ваш код подтверждения YAmdb!',
-            message=f'Ваш код подтверждения: {confirmation_code}',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[validated_data['email']],
-            fail_silently=False,
-        )
+        # Письмо ставится в очередь вместе с пользователем и уходит
+        # командой send_queued_emails, а не во время запроса.
+        with transaction.atomic():
+            user = self.existing_user or self.insert_user(validated_data)
+            confirmation_code = default_token_generator.make_token(user)
+            queue_email(
+                subject='Ваш код подтверждения YAmdb!',
+                message=f'Ваш код подтверждения: {confirmation_code}',
+                recipient=validated_data['email']
+            )
         return user
 
+    def insert_user(self, validated_data):
+        """Создаёт пользователя; гонки отсекают ограничения уникальности."""
+        try:
+            with transaction.atomic():
+                return User.objects.create(**validated_data)
+        except IntegrityError:
+            # Параллельная регистрация успела занять email или username.
+            users = list(User.objects.filter(
+                Q(email=validated_data['email'])
+                | Q(username=validated_data['username'])
+            )[:2])
+            if not users:
+                raise
+            check_signup_conflicts(validated_data, users)
+            return users[0]
+
 
 class TokenSerializer(serializers.Serializer):
     username = serializers.CharField(
@@ -133,7 +156,7 @@ class TokenSerializer(serializers.Serializer):
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     role = serializers.ChoiceField(
         choices=UserRole.choices,
         required=False,
@@ -153,24 +176,27 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         exclude = ('id',)
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         exclude = ('id',)
         model = Genre
 
 
-class TitleGETSerializer(serializers.ModelSerializer):
+class TitleGETSerializer(FieldsetSerializerMixin, serializers.ModelSerializer):
     """Сериализатор объектов модели Title для GET запросов."""
 
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
     rating = serializers.IntegerField(default=constants.DEFAULT_RATING_VALUE)
+    reviews_count = serializers.IntegerField(
+        source='rating_count', read_only=True
+    )
 
     class Meta:
         model = Title
@@ -179,6 +205,7 @@ class TitleGETSerializer(serializers.ModelSerializer):
             'name',
             'year',
             'rating',
+            'reviews_count',
             'description',
             'genre',
             'category'
@@ -193,10 +220,8 @@ class TitleGETSerializer(serializers.ModelSerializer):
 class TitleSerializer(serializers.ModelSerializer):
     """Сериализатор объектов модели Title."""
 
-    genre = serializers.SlugRelatedField(
-        slug_field='slug',
-        queryset=Genre.objects.all(),
-        many=True,
+    genre = serializers.ListField(
+        child=serializers.SlugField(),
         required=True,
         allow_empty=False
     )
@@ -216,5 +241,38 @@ class TitleSerializer(serializers.ModelSerializer):
             'category'
         )
 
+    def validate_genre(self, slugs):
+        """Находит все жанры одним запросом вместо запроса на каждый slug."""
+        slugs = list(dict.fromkeys(slugs))
+        genres = list(Genre.objects.filter(slug__in=slugs))
+        missing = set(slugs) - {genre.slug for genre in genres}
+        if missing:
+            raise serializers.ValidationError(
+                f'Жанры не найдены: {", ".join(sorted(missing))}.'
+            )
+        return genres
+
+    @staticmethod
+    def set_genres(title, genres):
+        GenreTitle.objects.bulk_create(
+            GenreTitle(genre=genre, title=title) for genre in genres
+        )
+
+    def create(self, validated_data):
+        genres = validated_data.pop('genre')
+        with transaction.atomic():
+            title = Title.objects.create(**validated_data)
+            self.set_genres(title, genres)
+        return title
+
+    def update(self, title, validated_data):
+        genres = validated_data.pop('genre', None)
+        with transaction.atomic():
+            title = super().update(title, validated_data)
+            if genres is not None:
+                GenreTitle.objects.filter(title=title).delete()
+                self.set_genres(title, genres)
+        return title
+
     def to_representation(self, title):
         return TitleGETSerializer(title).data
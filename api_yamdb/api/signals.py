@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, GenreTitle, Title
+from users.models import User
+
+from .authentication import forget_cached_user
+from .cache import (EPOCH_KEY, bump_versions, pending_callback,
+                    schedule_bump, version_key)
+
+CACHED_MODELS = (Category, Genre, Title, GenreTitle, Review, Comment, User)
+# Поля родителя, по которым версии ведутся отдельно для каждой строки.
+SCOPE_FIELDS = {
+    Review: 'title_id',
+    Comment: 'review_id',
+}
+
+
+def model_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    keys = [version_key(sender)]
+    field = SCOPE_FIELDS.get(sender)
+    if field is not None:
+        keys.append(version_key(sender, **{field: getattr(instance, field)}))
+    if sender is Comment:
+        schedule_commented_review_bump(instance)
+    schedule_bump(*keys)
+
+
+class PendingCommentedReviews:
+    """Отзывы, у которых изменились комментарии, без загруженного отзыва.
+
+    Произведения этих отзывов выбираются одним запросом при фиксации
+    транзакции, а не запросом на каждый комментарий при каскадном
+    удалении. Удалённые в той же транзакции отзывы уже сменили версию
+    своим сигналом.
+    """
+
+    def __init__(self):
+        self.review_ids = set()
+
+    def __call__(self):
+        title_ids = Review.objects.filter(
+            pk__in=self.review_ids
+        ).values_list('title_id', flat=True).distinct()
+        bump_versions(*(
+            version_key(Review, title_id=title_id) for title_id in title_ids
+        ))
+
+
+def schedule_commented_review_bump(comment):
+    """Версия отзывов произведения: в них выводится счётчик комментариев."""
+    if Comment.review.is_cached(comment):
+        schedule_bump(version_key(Review, title_id=comment.review.title_id))
+        return
+    pending = pending_callback(PendingCommentedReviews)
+    pending.review_ids.add(comment.review_id)
+    if not transaction.get_connection().in_atomic_block:
+        pending()
+
+
+def invalidate_response_cache(**kwargs):
+    """Сбрасывает кэш после изменений в обход сигналов моделей.
+
+    Вызывается после migrate и flush, а также командами массовой
+    загрузки данных.
+    """
+    bump_versions(EPOCH_KEY)
+
+
+def connect_signals():
+    for model in CACHED_MODELS:
+        post_save.connect(model_changed, sender=model)
+        post_delete.connect(model_changed, sender=model)
+    post_save.connect(forget_cached_user, sender=User)
+    post_delete.connect(forget_cached_user, sender=User)
+    post_migrate.connect(invalidate_response_cache)
@@ -0,0 +1,152 @@
+"""Ограничение частоты запросов по алгоритму token bucket.
+
+Лимит задаётся строкой вида '5/min' в DEFAULT_THROTTLE_RATES: в ведре
+помещается пять запросов, и оно пополняется на пять запросов в минуту,
+то есть по одному раз в 12 секунд. Неиспользованные запросы копятся до
+ёмкости ведра, поэтому короткие всплески проходят, а постоянный поток
+упирается в скорость пополнения. Состояние ведра хранится в файловом
+кэше THROTTLE_CACHE_ALIAS, общем для всех процессов сервера. Чтение и
+запись ведра выполняются под эксклюзивной файловой блокировкой, иначе
+параллельные запросы прочли бы одно и то же число токенов и прошли все.
+"""
+import os
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: блокировка байта файла через msvcrt.
+    fcntl = None
+    import msvcrt
+
+THROTTLE_CACHE_ALIAS = 'throttle'
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+# Число файлов блокировок: вёдра делят их по первым символам хеша ключа.
+LOCK_STRIPES = 256
+
+
+def parse_rate(rate):
+    """Возвращает ёмкость ведра и время его полного пополнения."""
+    number, period = rate.split('/')
+    return int(number), DURATIONS[period[0]]
+
+
+@contextmanager
+def bucket_lock(cache_alias, digest):
+    """Эксклюзивная блокировка ведра, общая для всех процессов."""
+    lock_dir = os.path.join(
+        settings.CACHES[cache_alias]['LOCATION'], 'locks'
+    )
+    os.makedirs(lock_dir, mode=0o700, exist_ok=True)
+    stripe = int(digest, 16) % LOCK_STRIPES
+    with open(os.path.join(lock_dir, f'{stripe:02x}.lock'), 'a+b') as file:
+        if fcntl is not None:
+            # Блокировка снимается при закрытии файла.
+            fcntl.flock(file, fcntl.LOCK_EX)
+            yield
+            return
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Базовое ограничение: ведро на каждый ключ get_cache_key."""
+
+    scope = None
+    cache_alias = THROTTLE_CACHE_ALIAS
+
+    def __init__(self):
+        self.delay = None
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        """Ключ ведра или None, если запрос не ограничивается."""
+        raise NotImplementedError('.get_cache_key() must be overridden')
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        if rate is None:
+            return True
+        ident = self.get_cache_key(request, view)
+        if ident is None:
+            return True
+        capacity, period = parse_rate(rate)
+        digest = md5(f'{self.scope}:{ident}'.encode()).hexdigest()
+        with bucket_lock(self.cache_alias, digest):
+            return self.take_token(f'throttle:{digest}', capacity, period)
+
+    def take_token(self, key, capacity, period):
+        cache = caches[self.cache_alias]
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * capacity / period)
+        if tokens < 1:
+            self.delay = (1 - tokens) * period / capacity
+            return False
+        # Через period ведро снова полное, и запись не нужна.
+        cache.set(key, (tokens - 1, now), period)
+        return True
+
+    def wait(self):
+        return self.delay
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """Лимит '<throttle_scope представления>_<scope_suffix>'."""
+
+    scope_suffix = None
+
+    def allow_request(self, request, view):
+        self.scope = f'{view.throttle_scope}_{self.scope_suffix}'
+        return super().allow_request(request, view)
+
+
+class IPTokenBucketThrottle(ScopedTokenBucketThrottle):
+    scope_suffix = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameTokenBucketThrottle(ScopedTokenBucketThrottle):
+    """Ведро на username из тела запроса, без учёта регистра."""
+
+    scope_suffix = 'username'
+
+    def get_cache_key(self, request, view):
+        # Тело без полей, например JSON-список, отклонит сериализатор.
+        if not isinstance(request.data, Mapping):
+            return None
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return username.lower()
+
+
+class RoleTokenBucketThrottle(TokenBucketThrottle):
+    """Квоты аутентифицированных пользователей по ролям: role_<роль>."""
+
+    def allow_request(self, request, view):
+        user = request.user
+        if not user.is_authenticated:
+            return True
+        self.scope = 'role_admin' if user.is_admin else f'role_{user.role}'
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        return str(request.user.pk)
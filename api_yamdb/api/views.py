@@ -1,29 +1,67 @@
-from django.db.models import Avg
+from django.conf import settings
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, pagination, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import (SAFE_METHODS, AllowAny,
                                         IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import Review
-from titles.models import Category, Genre, Title
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, GenreTitle, Title
 from users.models import User
+
+from api_yamdb import constants
+from .cache import AnonymousCacheMixin, ConditionalGetMixin, version_key
+from .fast_serializers import TitleRowSerializer, title_rows
+from .fieldsets import SparseFieldsetMixin
 from .filters import TitleFilter
+from .pagination import PageNumberOrCursorPagination
 from .permissions import (IsAdmin, IsAdminOrReadOnly,
                           IsAuthorModeratorAdminOrReadOnly)
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, ReviewSerializer, SignUpSerializer,
                           TitleGETSerializer, TitleSerializer, TokenSerializer,
                           UserSerializer)
+from .throttling import IPTokenBucketThrottle, UsernameTokenBucketThrottle
+
+
+def with_authors(queryset):
+    """Подгружает имена авторов без отдельного запроса на каждую строку."""
+    if settings.DENORMALIZED_AUTHOR_USERNAME:
+        # Имя берётся из столбца author_username, JOIN не нужен.
+        return queryset
+    return queryset.select_related('author')
+
+
+class NestedParentMixin:
+    """Находит родительские объекты вложенного маршрута раз за запрос.
 
+    Найденные объекты хранятся на запросе, поэтому повторные вызовы
+    из get_queryset, perform_create и сериализатора не обращаются
+    к базе.
+    """
 
-class CreateListDestroyViewSet(mixins.CreateModelMixin,
+    def get_parent(self, model, **lookups):
+        parents = getattr(self.request, 'nested_parents', None)
+        if parents is None:
+            parents = self.request.nested_parents = {}
+        key = (model, tuple(sorted(lookups.items())))
+        if key not in parents:
+            parents[key] = get_object_or_404(model, **lookups)
+        return parents[key]
+
+
+class CreateListDestroyViewSet(SparseFieldsetMixin,
+                               AnonymousCacheMixin,
+                               mixins.CreateModelMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
@@ -37,63 +75,125 @@ class CreateListDestroyViewSet(mixins.CreateModelMixin,
 class CategoryViewSet(CreateListDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_models = (Category,)
 
 
 class GenreViewSet(CreateListDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(SparseFieldsetMixin, ConditionalGetMixin, ModelViewSet):
     permission_classes = (IsAdminOrReadOnly,)
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('name')
+    queryset = (
+        Title.objects
+        .select_related('category')
+        .prefetch_related('genre')
+        .order_by('name', 'id')
+    )
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('name', 'id')
+    cache_models = (Title, Category, Genre, GenreTitle, Review)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     http_method_names = ('get', 'post', 'patch', 'delete')
+    # Список читается кортежами без моделей, см. api.fast_serializers.
+    fast_list = True
 
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
             return TitleGETSerializer
         return TitleSerializer
 
+    def use_fast_list(self):
+        return self.fast_list and self.action == 'list'
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.use_fast_list():
+            return title_rows(queryset, self.get_fieldset())
+        return queryset
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_serializer(self, *args, **kwargs):
+        if self.use_fast_list():
+            return TitleRowSerializer(*args, fields=self.get_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+
+class ReviewViewSet(NestedParentMixin, SparseFieldsetMixin,
+                    ConditionalGetMixin, viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'patch', 'delete']
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsAuthorModeratorAdminOrReadOnly)
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('-pub_date', '-id')
+
+    def get_cache_dependencies(self):
+        return [
+            version_key(Title),
+            version_key(User),
+            version_key(Review, title_id=int(self.kwargs['title_id'])),
+        ]
 
     def get_queryset(self):
         title = self.get_title()
-        return title.reviews.all()
+        return with_authors(title.reviews.all())
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        return self.get_parent(Title, id=self.kwargs.get('title_id'))
+
+    def get_known_count(self):
+        # У каждого отзыва есть оценка, поэтому отзывов на произведение
+        # столько же, сколько оценок в поддерживаемом rating_count.
+        return self.get_title().rating_count
 
     def perform_create(self, serializer):
         title = self.get_title()
-        serializer.save(author=self.request.user, title=title)
+        try:
+            serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            # Повторный отзыв отсекает ограничение unique_review_per_author,
+            # а не проверка перед вставкой, которую обходят гонки.
+            if not Review.objects.filter(
+                author=self.request.user, title=title
+            ).exists():
+                raise
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Вы уже оставили отзыв на это произведение.'
+            ]})
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(NestedParentMixin, SparseFieldsetMixin,
+                     ConditionalGetMixin, viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'patch', 'delete']
     serializer_class = CommentSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsAuthorModeratorAdminOrReadOnly)
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('-pub_date', '-id')
 
     def get_review(self):
-        review = get_object_or_404(
+        return self.get_parent(
             Review,
             id=self.kwargs.get('review_id'),
             title_id=self.kwargs.get('title_id')
         )
-        return review
+
+    def get_cache_dependencies(self):
+        return [
+            version_key(User),
+            version_key(Review, title_id=int(self.kwargs['title_id'])),
+            version_key(Comment, review_id=int(self.kwargs['review_id'])),
+        ]
+
+    def get_known_count(self):
+        return self.get_review().comments_count
 
     def get_queryset(self):
         review = self.get_review()
-        return review.comments.all()
+        return with_authors(review.comments.all())
 
     def perform_create(self, serializer):
         review = self.get_review()
@@ -102,6 +202,8 @@ class CommentViewSet(viewsets.ModelViewSet):
 
 class TokenObtainView(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (IPTokenBucketThrottle, UsernameTokenBucketThrottle)
+    throttle_scope = 'token'
 
     def post(self, request, *args, **kwargs):
         serializer = TokenSerializer(data=request.data)
@@ -116,6 +218,8 @@ class TokenObtainView(APIView):
 
 class SignUpView(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (IPTokenBucketThrottle, UsernameTokenBucketThrottle)
+    throttle_scope = 'signup'
 
     def post(self, request, *args, **kwargs):
         serializer = SignUpSerializer(data=request.data)
@@ -124,7 +228,7 @@ class SignUpView(APIView):
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAdmin,)
@@ -136,9 +240,32 @@ class UserViewSet(viewsets.ModelViewSet):
         queryset = self.queryset
         search_term = self.request.query_params.get('search', None)
         if search_term:
-            queryset = queryset.filter(username__icontains=search_term)
+            queryset = queryset.username_prefix(search_term)
         return queryset
 
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='autocomplete',
+        url_name='users_autocomplete'
+    )
+    def autocomplete(self, request, *args, **kwargs):
+        """Первые по алфавиту username, начинающиеся с ?q=."""
+        prefix = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get(
+                'limit', constants.AUTOCOMPLETE_LIMIT
+            ))
+        except ValueError:
+            raise ValidationError({'limit': 'Ожидается целое число.'})
+        limit = max(1, min(limit, constants.MAX_AUTOCOMPLETE_LIMIT))
+        if not prefix:
+            return Response([])
+        return Response(list(
+            User.objects.username_prefix(prefix)
+            .values_list('username', flat=True)[:limit]
+        ))
+
     @action(
         detail=False,
         methods=['get', 'patch'],
@@ -148,6 +275,10 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me(self, request, *args, **kwargs):
         current_user = request.user
+        # Из кэша аутентификации приходят только поля для проверки прав.
+        deferred = current_user.get_deferred_fields()
+        if deferred:
+            current_user.refresh_from_db(fields=deferred)
         if request.method == 'PATCH':
             serializer = self.get_serializer(
                 current_user,
@@ -8,3 +8,5 @@ MAX_TEXT_LENGTH = 50
 USERNAME_REGEX = r'^[\w.@+-]+\Z'
 UNAVAILABLE_USERNAME = 'me'
 LIMIT_ROLE_LENGTH = 20
+AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
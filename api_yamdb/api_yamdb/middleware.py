@@ -0,0 +1,121 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('api_yamdb.performance')
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 1.0,
+    'SLOW_REQUEST_MS': 500,
+    'HEADER': True,
+}
+
+
+class QueryTimer:
+    """Обёртка execute_wrapper, суммирующая время SQL-запросов."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class ServerTimingMiddleware:
+    """Замеряет, на что уходит время запроса.
+
+    Для выбранных с вероятностью SAMPLE_RATE запросов считает время
+    и число SQL-запросов, время представления и рендеринга ответа и
+    отдаёт их в заголовке Server-Timing. Запросы дольше SLOW_REQUEST_MS
+    пишутся в лог одной JSON-строкой. Для остальных запросов замеряется
+    только общее время.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @property
+    def config(self):
+        return {**DEFAULTS, **getattr(settings, 'SERVER_TIMING', {})}
+
+    def __call__(self, request):
+        config = self.config
+        if not config['ENABLED']:
+            return self.get_response(request)
+        started = time.perf_counter()
+        if random.random() >= config['SAMPLE_RATE']:
+            response = self.get_response(request)
+            self.log(request, response, {
+                'total': time.perf_counter() - started
+            }, sampled=False)
+            return response
+
+        request._timing = {}
+        timer = QueryTimer()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        marks = request._timing
+        timing = {
+            'total': time.perf_counter() - started,
+            'db': timer.duration,
+        }
+        if 'view_end' in marks:
+            timing['view'] = marks['view_end'] - marks['view_start']
+            if 'render_end' in marks:
+                timing['render'] = marks['render_end'] - marks['view_end']
+        if config['HEADER']:
+            response['Server-Timing'] = ', '.join(
+                f'{name};dur={duration * 1000:.1f}'
+                + (f';desc="{timer.count} queries"' if name == 'db' else '')
+                for name, duration in timing.items()
+            )
+        self.log(request, response, timing, sampled=True,
+                 queries=timer.count)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, '_timing'):
+            request._timing['view_start'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = getattr(request, '_timing', None)
+        if timing is not None and 'view_start' in timing:
+            timing['view_end'] = time.perf_counter()
+            response.add_post_render_callback(
+                lambda response: timing.update(
+                    render_end=time.perf_counter()
+                )
+            )
+        return response
+
+    def log(self, request, response, timing, sampled, **extra):
+        """Пишет медленные запросы в WARNING, остальные замеры в DEBUG."""
+        slow = timing['total'] * 1000 >= self.config['SLOW_REQUEST_MS']
+        level = logging.WARNING if slow else logging.DEBUG
+        if not (slow or sampled) or not logger.isEnabledFor(level):
+            return
+        logger.log(level, json.dumps({
+            'event': 'slow_request' if slow else 'request',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **{
+                f'{name}_ms': round(duration * 1000, 1)
+                for name, duration in timing.items()
+            },
+            **extra,
+        }))
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -31,6 +32,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.middleware.ServerTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,9 +68,62 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Тестовая база в файле, а не в памяти: параллельные транзакции
+        # ждут блокировку, как в рабочей базе, а не падают сразу.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# Cache
+
+# Файловые кэши хранят данные в pickle, поэтому каталог доступен только
+# владельцу процесса. chmod чужого каталога завершится ошибкой.
+CACHE_DIR = Path(os.environ.get('API_YAMDB_CACHE_DIR', BASE_DIR / 'cache'))
+CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+CACHE_DIR.chmod(0o700)
+
+CACHES = {
+    'default': {
+        # Файловый кэш общий для всех процессов сервера и не требует Redis.
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'default',
+        # При переполнении файловый кэш удаляет треть записей, включая
+        # версии моделей; запас исключает это при обычной нагрузке.
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # Вёдра ограничения частоты запросов: отдельно, чтобы ключи по
+    # IP-адресам не вытесняли версии моделей из основного кэша.
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'default',
+    # Время жизни и число записей в LRU-кэше каждого процесса.
+    'TTL': 60,
+    'MAX_ENTRIES': 1024,
+    # Время жизни закэшированного числа строк для пагинации.
+    'COUNT_TTL': 300,
+}
+
+AUTH_CACHE = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'default',
+    # Число проверенных токенов в LRU-кэше каждого процесса.
+    'TOKEN_MAX_ENTRIES': 10000,
+    # Время жизни пользователя в общем кэше; запись сбрасывается
+    # при изменении или удалении пользователя.
+    'USER_TTL': 60,
+}
+
+# Имена авторов отзывов и комментариев читаются из денормализованного
+# столбца author_username вместо JOIN с таблицей пользователей.
+DENORMALIZED_AUTHOR_USERNAME = False
+
 # Auth model
 
 AUTH_USER_MODEL = 'users.User'
@@ -80,14 +135,30 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.OrderingFilter',
-    ]
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.RoleTokenBucketThrottle',
+    ],
+    # Ёмкость ведра и скорость его пополнения, см. api.throttling.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '10/min',
+        'signup_username': '3/min',
+        'token_ip': '30/min',
+        'token_username': '5/min',
+        'role_user': '120/min',
+        'role_moderator': '300/min',
+        'role_admin': None,
+    },
+    # Число доверенных прокси перед сервером. При 0 лимиты по IP берут
+    # REMOTE_ADDR: заголовок X-Forwarded-For подделывается клиентом.
+    'NUM_PROXIES': 0,
 }
 
 # Password validation
@@ -131,6 +202,16 @@ EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = 'pedropedrissimo0@gmail.com'
 EMAIL_HOST_PASSWORD = '8906451844pedro'
+
+SERVER_TIMING = {
+    'ENABLED': True,
+    # Доля запросов с подробными замерами и заголовком Server-Timing.
+    'SAMPLE_RATE': 1.0 if DEBUG else 0.05,
+    # Запросы дольше этого порога пишутся в лог api_yamdb.performance.
+    'SLOW_REQUEST_MS': 500,
+    'HEADER': True,
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
 }
@@ -0,0 +1,68 @@
+from api.signals import invalidate_response_cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+from reviews.models import Review
+from reviews.services import (comments_count_drift,
+                              recalculate_comments_counts,
+                              recalculate_title_ratings, title_rating_drift)
+from titles.models import Title
+
+# Модель, поиск расхождений и пересчёт для каждого счётчика.
+COUNTERS = (
+    (Title, title_rating_drift, recalculate_title_ratings),
+    (Review, comments_count_drift, recalculate_comments_counts),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Find and repair drift in title rating aggregates and review '
+        'comment counters'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Rows checked per transaction (by primary key range).'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report rows with drifted counters.'
+        )
+
+    def handle(self, *args, **options):
+        repaired = 0
+        for model, find_drift, recalculate in COUNTERS:
+            drifted = self.reconcile(
+                model, find_drift, recalculate, options['batch_size'],
+                options['dry_run']
+            )
+            repaired += drifted
+            self.stdout.write(f'{model._meta.label}: {drifted} drifted rows')
+        if options['dry_run']:
+            return
+        if repaired:
+            invalidate_response_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f'Counters reconciled, {repaired} rows repaired'
+        ))
+
+    def reconcile(self, model, find_drift, recalculate, batch_size,
+                  dry_run):
+        """Проверяет таблицу диапазонами id и чинит только расхождения."""
+        bounds = model.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            return 0
+        drifted = 0
+        for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+            with transaction.atomic():
+                ids = list(find_drift(
+                    model.objects.filter(
+                        pk__gte=start, pk__lt=start + batch_size
+                    )
+                ).values_list('pk', flat=True))
+                if ids and not dry_run:
+                    recalculate(model.objects.filter(pk__in=ids))
+            drifted += len(ids)
+        return drifted
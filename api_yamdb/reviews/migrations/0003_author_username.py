@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 03:41
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_author_username(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    usernames = User.objects.filter(
+        pk=OuterRef('author_id')
+    ).values('username')
+    for name in ('Review', 'Comment'):
+        apps.get_model('reviews', name).objects.update(
+            author_username=Subquery(usernames)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_review_comments_count'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='author_username',
+            field=models.CharField(blank=True, editable=False, help_text='Копия username автора для чтения без JOIN', max_length=150, verbose_name='Имя автора'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='author_username',
+            field=models.CharField(blank=True, editable=False, help_text='Копия username автора для чтения без JOIN', max_length=150, verbose_name='Имя автора'),
+        ),
+        migrations.RunPython(fill_author_username, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,9 @@
 from api.validators import validate_score_range
-from django.db import models
+from django.db import models, transaction
 from titles.models import Title
 from users.models import User
 
-from api_yamdb.constants import MAX_TEXT_LENGTH
+from api_yamdb.constants import LIMIT_USERNAME, MAX_TEXT_LENGTH
 
 
 class AbstractReviewComment(models.Model):
@@ -20,6 +20,13 @@ class AbstractReviewComment(models.Model):
         editable=False,
         related_name='%(class)ss'
     )
+    author_username = models.CharField(
+        verbose_name='Имя автора',
+        max_length=LIMIT_USERNAME,
+        blank=True,
+        editable=False,
+        help_text='Копия username автора для чтения без JOIN'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
         auto_now_add=True,
@@ -37,6 +44,12 @@ class AbstractReviewComment(models.Model):
             else self.text
         )
 
+    def save(self, *args, **kwargs):
+        # При переименовании автора копии обновляются сигналом users.User.
+        if not self.author_username and self.author_id is not None:
+            self.author_username = self.author.username
+        super().save(*args, **kwargs)
+
 
 class Review(AbstractReviewComment):
     """Модель для хранения отзывов на произведения."""
@@ -51,6 +64,11 @@ class Review(AbstractReviewComment):
         verbose_name='Оценка',
         validators=[validate_score_range]
     )
+    comments_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев',
+        default=0,
+        editable=False
+    )
 
     class Meta(AbstractReviewComment.Meta):
         constraints = [
@@ -59,12 +77,24 @@ class Review(AbstractReviewComment):
                 name='unique_review_per_author'
             )
         ]
+        indexes = [
+            # Порядок совпадает с сортировкой курсорной пагинации.
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
     def __str__(self):
         return f'Отзыв {self.id} от {self.author.username}'
 
+    def save(self, *args, **kwargs):
+        # Агрегаты рейтинга обновляются в post_save в той же транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(AbstractReviewComment):
     """Модель для комментариев к отзывам."""
@@ -76,5 +106,16 @@ class Comment(AbstractReviewComment):
     )
 
     class Meta(AbstractReviewComment.Meta):  # Тут наследую Meta от base class
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+
+    def save(self, *args, **kwargs):
+        # Счётчик комментариев отзыва обновляется в post_save.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
+from titles.models import Title
+from users.models import User
+
+from .models import Comment, Review
+
+
+def _refresh_rating(queryset):
+    """Пересчитывает средний рейтинг из сохранённых суммы и количества."""
+    queryset.update(rating=Case(
+        When(rating_count=0, then=None),
+        default=F('rating_sum') / F('rating_count')
+    ))
+
+
+def _total(model, parent_field, aggregate):
+    """Подзапрос с агрегатом по строкам model текущего родителя."""
+    rows = (
+        model.objects.filter(**{parent_field: OuterRef('pk')})
+        .order_by()
+        .values(parent_field)
+    )
+    return Coalesce(
+        Subquery(rows.annotate(total=aggregate).values('total')), 0
+    )
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """Атомарно применяет изменение оценок к агрегатам произведения."""
+    queryset = Title.objects.filter(pk=title_id)
+    with transaction.atomic():
+        queryset.update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=F('rating_count') + count_delta
+        )
+        _refresh_rating(queryset)
+
+
+def update_comments_count(review_id, delta):
+    """Атомарно меняет счётчик комментариев отзыва."""
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+def recalculate_title_ratings(queryset=None):
+    """Пересобирает агрегаты рейтинга по таблице отзывов.
+
+    Нужен после массовых операций, которые обходят сигналы моделей,
+    например bulk_create при загрузке данных из CSV.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    with transaction.atomic():
+        queryset.update(
+            rating_sum=_total(Review, 'title', Sum('score')),
+            rating_count=_total(Review, 'title', Count('pk'))
+        )
+        _refresh_rating(queryset)
+
+
+def recalculate_comments_counts(queryset=None):
+    """Пересобирает счётчики комментариев по таблице комментариев."""
+    if queryset is None:
+        queryset = Review.objects.all()
+    queryset.update(comments_count=_total(Comment, 'review', Count('pk')))
+
+
+def title_rating_drift(queryset):
+    """Произведения, у которых агрегаты рейтинга разошлись с отзывами."""
+    return queryset.annotate(
+        actual_sum=_total(Review, 'title', Sum('score')),
+        actual_count=_total(Review, 'title', Count('pk'))
+    ).exclude(
+        rating_sum=F('actual_sum'), rating_count=F('actual_count')
+    )
+
+
+def comments_count_drift(queryset):
+    """Отзывы, у которых счётчик разошёлся с числом комментариев."""
+    return queryset.annotate(
+        actual_count=_total(Comment, 'review', Count('pk'))
+    ).exclude(comments_count=F('actual_count'))
+
+
+def rename_author(user_id, username):
+    """Переносит новое имя пользователя в его отзывы и комментарии.
+
+    По одному UPDATE на таблицу, какими бы большими они ни были.
+    """
+    for model in (Review, Comment):
+        model.objects.filter(author_id=user_id).exclude(
+            author_username=username
+        ).update(author_username=username)
+
+
+def sync_author_usernames(queryset):
+    """Исправляет author_username у строк, где копия разошлась с автором.
+
+    Нужна после bulk-операций, которые обходят Model.save и сигналы.
+    """
+    queryset.exclude(author_username=F('author__username')).update(
+        author_username=Subquery(
+            User.objects.filter(pk=OuterRef('author_id')).values('username')
+        )
+    )
@@ -0,0 +1,72 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from titles.models import Title
+from users.models import User
+
+from .models import Comment, Review
+from .services import (recalculate_title_ratings, rename_author,
+                       update_comments_count, update_title_rating)
+
+
+def _withdraw_score(title_id, score):
+    if score is None:
+        recalculate_title_ratings(Title.objects.filter(pk=title_id))
+    else:
+        update_title_rating(title_id, -score, -1)
+
+
+@receiver(post_init, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    # Через __dict__, чтобы не подгружать отложенные поля.
+    instance._stored_score = instance.__dict__.get('score')
+    instance._stored_title_id = instance.__dict__.get('title_id')
+
+
+@receiver(post_save, sender=Review)
+def apply_review_score(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        update_title_rating(instance.title_id, instance.score, 1)
+    elif instance._stored_title_id not in (None, instance.title_id):
+        _withdraw_score(instance._stored_title_id, instance._stored_score)
+        update_title_rating(instance.title_id, instance.score, 1)
+    elif instance._stored_score is None:
+        recalculate_title_ratings(
+            Title.objects.filter(pk=instance.title_id)
+        )
+    elif instance._stored_score != instance.score:
+        update_title_rating(
+            instance.title_id, instance.score - instance._stored_score, 0
+        )
+    instance._stored_score = instance.score
+    instance._stored_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def revert_review_score(sender, instance, **kwargs):
+    _withdraw_score(instance.title_id, instance._stored_score)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        update_comments_count(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    update_comments_count(instance.review_id, -1)
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._stored_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def propagate_username(sender, instance, created, raw=False, **kwargs):
+    if (not created and not raw
+            and instance._stored_username not in (None, instance.username)):
+        rename_author(instance.pk, instance.username)
+    instance._stored_username = instance.username
@@ -0,0 +1,258 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from api.signals import invalidate_response_cache
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from reviews.models import Comment, Review
+from reviews.services import (recalculate_comments_counts,
+                              recalculate_title_ratings,
+                              sync_author_usernames)
+from titles.models import Category, Genre, GenreTitle, Title
+from users.models import User
+
+from api_yamdb.constants import MAX_SCORE, MIN_SCORE
+
+DEFAULT_BATCH_SIZE = 5000
+FIRST_YEAR = 1900
+DATE_RANGE_DAYS = 3650
+WORDS = (
+    'время жизнь день рука работа слово место лицо друг глаз вопрос дом '
+    'сторона страна мир случай голова ребёнок сила конец вид система '
+    'город отец вечер ночь история земля дорога война море небо огонь '
+    'ветер свет тень память тайна мечта путь сердце песня звезда остров'
+).split()
+
+
+@contextmanager
+def explicit_pub_dates(*models):
+    """Позволяет записать в pub_date заданные значения вместо now().
+
+    Без этого все сгенерированные отзывы получили бы одну дату,
+    и планы запросов с сортировкой по -pub_date были бы нереалистичны.
+    """
+    fields = [model._meta.get_field('pub_date') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with a reproducible synthetic dataset'
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('users', 1000),
+            ('categories', 10),
+            ('genres', 50),
+            ('titles', 10000),
+            ('reviews', 100000),
+            ('comments', 100000),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default,
+                help=f'Number of {name} to create (default {default}).'
+            )
+        parser.add_argument(
+            '--max-genres-per-title', type=int, default=3,
+            help='Each title gets from 1 to this many genres.'
+        )
+        parser.add_argument(
+            '--skew', type=float, default=1.0,
+            help=(
+                'Zipf exponent for picking titles, reviews and authors; '
+                '0 gives a uniform distribution.'
+            )
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of rows per INSERT statement.'
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.skew = options['skew']
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        with transaction.atomic(), explicit_pub_dates(Review, Comment):
+            user_ids = self.insert(
+                User, options['users'], self.build_user
+            )
+            category_ids = self.insert(
+                Category, options['categories'], self.build_slugged(Category)
+            )
+            genre_ids = self.insert(
+                Genre, options['genres'], self.build_slugged(Genre)
+            )
+            self.category_ids = self.skewed(category_ids)
+            self.genre_ids = genre_ids
+            self.max_genres = min(options['max_genres_per_title'],
+                                  len(genre_ids))
+            title_ids = self.insert(
+                Title, options['titles'], self.build_title
+            )
+            self.title_ids = title_ids
+            self.insert_links()
+            self.title_ids = self.skewed(title_ids)
+            self.author_ids = self.skewed(user_ids)
+            self.review_pairs = set()
+            review_ids = self.insert(
+                Review, options['reviews'], self.build_review
+            )
+            self.review_ids = self.skewed(review_ids)
+            comment_ids = self.insert(
+                Comment, options['comments'], self.build_comment
+            )
+            if title_ids:
+                recalculate_title_ratings(
+                    Title.objects.filter(pk__gte=title_ids[0])
+                )
+            if review_ids:
+                recalculate_comments_counts(
+                    Review.objects.filter(pk__gte=review_ids[0])
+                )
+                sync_author_usernames(
+                    Review.objects.filter(pk__gte=review_ids[0])
+                )
+            if comment_ids:
+                sync_author_usernames(
+                    Comment.objects.filter(pk__gte=comment_ids[0])
+                )
+        invalidate_response_cache()
+        self.stdout.write(self.style.SUCCESS('Data generated successfully'))
+
+    def insert(self, model, amount, build):
+        """Создаёт до amount объектов пачками и возвращает их id."""
+        started = time.monotonic()
+        first_id = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        objects = (
+            build(pk) for pk in range(first_id, first_id + amount)
+        )
+        ids = []
+        while True:
+            batch = [obj for obj in islice(objects, self.batch_size) if obj]
+            if not batch:
+                break
+            model.objects.bulk_create(batch)
+            ids.extend(obj.pk for obj in batch)
+        self.report(model, len(ids), started)
+        return ids
+
+    def insert_links(self):
+        if not self.max_genres:
+            return
+        started = time.monotonic()
+        links = (
+            GenreTitle(title_id=title_id, genre_id=genre_id)
+            for title_id in self.title_ids
+            for genre_id in self.random.sample(
+                self.genre_ids, self.random.randint(1, self.max_genres)
+            )
+        )
+        created = 0
+        while True:
+            batch = list(islice(links, self.batch_size))
+            if not batch:
+                break
+            GenreTitle.objects.bulk_create(batch)
+            created += len(batch)
+        self.report(GenreTitle, created, started)
+
+    def report(self, model, created, started):
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{model._meta.label}: {created} rows in {elapsed:.2f}s '
+            f'({created / elapsed if elapsed else created:.0f} rows/s)'
+        )
+
+    def skewed(self, ids):
+        """Возвращает функцию выбора id с распределением Ципфа.
+
+        Первые id выбираются чаще остальных: это «горячие» произведения,
+        популярные отзывы и самые активные авторы.
+        """
+        ids = list(ids)
+        if not ids:
+            return lambda: None
+        weights = list(accumulate(
+            1 / (rank ** self.skew) for rank in range(1, len(ids) + 1)
+        ))
+        return lambda: self.random.choices(ids, cum_weights=weights)[0]
+
+    def text(self, min_words, max_words):
+        return ' '.join(self.random.choices(
+            WORDS, k=self.random.randint(min_words, max_words)
+        )).capitalize()
+
+    def pub_date(self):
+        return self.now - timedelta(
+            seconds=self.random.randrange(DATE_RANGE_DAYS * 24 * 60 * 60)
+        )
+
+    def build_user(self, pk):
+        if not hasattr(self, 'password'):
+            self.password = make_password(None)
+        return User(
+            id=pk,
+            username=f'gen_user_{pk}',
+            email=f'gen_user_{pk}@yamdb.fake',
+            password=self.password
+        )
+
+    def build_slugged(self, model):
+        prefix = model._meta.model_name
+        return lambda pk: model(
+            id=pk, name=f'{self.text(1, 2)} {pk}', slug=f'{prefix}-{pk}'
+        )
+
+    def build_title(self, pk):
+        return Title(
+            id=pk,
+            name=self.text(1, 4),
+            year=self.random.randint(FIRST_YEAR, self.now.year),
+            description=self.text(5, 30),
+            category_id=self.category_ids()
+        )
+
+    def build_review(self, pk):
+        # У автора может быть только один отзыв на произведение.
+        for _ in range(10):
+            pair = (self.author_ids(), self.title_ids())
+            if None in pair:
+                return None
+            if pair not in self.review_pairs:
+                break
+        else:
+            return None
+        self.review_pairs.add(pair)
+        return Review(
+            id=pk,
+            author_id=pair[0],
+            title_id=pair[1],
+            score=self.random.randint(MIN_SCORE, MAX_SCORE),
+            text=self.text(5, 60),
+            pub_date=self.pub_date()
+        )
+
+    def build_comment(self, pk):
+        author_id, review_id = self.author_ids(), self.review_ids()
+        if author_id is None or review_id is None:
+            return None
+        return Comment(
+            id=pk,
+            author_id=author_id,
+            review_id=review_id,
+            text=self.text(3, 30),
+            pub_date=self.pub_date()
+        )
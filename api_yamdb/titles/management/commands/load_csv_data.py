@@ -1,58 +1,307 @@
 import csv
+import hashlib
+import time
+from itertools import islice
 
+from api.signals import invalidate_response_cache
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from reviews.models import Comment, Review
-from titles.models import Category, Genre, GenreTitle, Title
+from reviews.services import (recalculate_comments_counts,
+                              recalculate_title_ratings,
+                              sync_author_usernames)
+from titles.models import Category, CsvRowHash, Genre, GenreTitle, Title
 from users.models import User
 
 DATA_PATH = f'{settings.BASE_DIR}/static/data'
+DEFAULT_BATCH_SIZE = 5000
 
-MODELS_AND_CSV_FILES = {
-    User: 'users.csv',
-    Category: 'category.csv',
-    Genre: 'genre.csv',
-    Title: 'titles.csv',
-    GenreTitle: 'genre_title.csv',
-    Review: 'review.csv',
-    Comment: 'comments.csv',
+# Поле родителя, агрегаты которого зависят от строк модели.
+PARENT_FIELDS = {
+    Review: 'title_id',
+    Comment: 'review_id',
 }
+# Модели с копией имени автора author_username.
+AUTHORED_MODELS = (Review, Comment)
+
+# Модель, файл и переименования колонок CSV в атрибуты модели.
+MODELS_AND_CSV_FILES = (
+    (User, 'users.csv', {}),
+    (Category, 'category.csv', {}),
+    (Genre, 'genre.csv', {}),
+    (Title, 'titles.csv', {'category': 'category_id'}),
+    (GenreTitle, 'genre_title.csv', {}),
+    (Review, 'review.csv', {'author': 'author_id'}),
+    (Comment, 'comments.csv', {'author': 'author_id'}),
+)
+
+
+def row_digest(values):
+    return hashlib.md5(
+        '\x1f'.join(f'{key}={values[key]}' for key in sorted(values))
+        .encode('utf-8')
+    ).hexdigest()
 
 
 class Command(BaseCommand):
     help = 'Load data from CSV files into the database'
 
-    def handle(self, *args, **kwargs):
-        for model, csv_file_name in MODELS_AND_CSV_FILES.items():
-            with open(
-                    file=f'{DATA_PATH}/{csv_file_name}',
-                    mode='r',
-                    encoding='utf-8'
-            ) as csv_file:
-                reader = csv.DictReader(csv_file)
-                if csv_file_name == 'titles.csv':
-                    data = [Title(
-                        id=row['id'],
-                        name=row['name'],
-                        year=row['year'],
-                        category=Category.objects.get(id=row['category'])
-                    ) for row in reader]
-                elif csv_file_name == 'review.csv':
-                    data = [Review(
-                        id=row['id'],
-                        title=Title.objects.get(id=row['title_id']),
-                        author=User.objects.get(id=row['author']),
-                        text=row['text'],
-                        score=row['score']
-                    ) for row in reader]
-                elif csv_file_name == 'comments.csv':
-                    data = [Comment(
-                        id=row['id'],
-                        review=Review.objects.get(id=row['review_id']),
-                        author=User.objects.get(id=row['author']),
-                        text=row['text']
-                    ) for row in reader]
-                else:
-                    data = [model(**row) for row in reader]
-                model.objects.bulk_create(data)
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DATA_PATH,
+            help='Directory with the CSV files.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of rows per INSERT statement.'
+        )
+        parser.add_argument(
+            '--check-fk',
+            action='store_true',
+            help='Skip rows whose foreign keys point to missing objects.'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help=(
+                'Insert new and update changed rows only, comparing '
+                'per-row content hashes with the previous incremental load.'
+            )
+        )
+        parser.add_argument(
+            '--delete-missing',
+            action='store_true',
+            help='With --incremental, delete rows absent from the CSV.'
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.check_fk = options['check_fk']
+        self.incremental = options['incremental']
+        self.delete_missing = options['delete_missing']
+        self.known_ids = {}
+        self.rated_title_ids = set()
+        self.commented_review_ids = set()
+        with transaction.atomic():
+            for model, csv_file_name, columns in MODELS_AND_CSV_FILES:
+                self.load_file(
+                    model, f"{options['path']}/{csv_file_name}", columns
+                )
+            if not self.incremental:
+                recalculate_title_ratings()
+                recalculate_comments_counts()
+                # Копии имён авторов: bulk_create обходит Model.save.
+                for model in AUTHORED_MODELS:
+                    sync_author_usernames(model.objects.all())
+            else:
+                self.recalculate_affected()
+        invalidate_response_cache()
         self.stdout.write(self.style.SUCCESS('Data loaded successfully'))
+
+    def recalculate_affected(self):
+        if self.rated_title_ids:
+            recalculate_title_ratings(
+                Title.objects.filter(pk__in=self.rated_title_ids)
+            )
+        if self.commented_review_ids:
+            recalculate_comments_counts(
+                Review.objects.filter(pk__in=self.commented_review_ids)
+            )
+
+    def load_file(self, model, path, columns):
+        started = time.monotonic()
+        self.skipped = 0
+        self.stats = {'loaded': 0}
+        with open(file=path, mode='r', encoding='utf-8') as csv_file:
+            rows = self.read_rows(model, csv_file, columns)
+            if self.incremental:
+                self.sync_rows(model, rows)
+            else:
+                self.insert_rows(model, rows)
+        elapsed = time.monotonic() - started
+        self.known_ids.pop(model, None)
+        self.stats['skipped'] = self.skipped
+        loaded = self.stats.pop('loaded')
+        details = ', '.join(
+            f'{count} {action}'
+            for action, count in self.stats.items() if count
+        )
+        self.stdout.write(
+            f'{model._meta.label}: {loaded} rows in {elapsed:.2f}s '
+            f'({loaded / elapsed if elapsed else loaded:.0f} rows/s)'
+            + (f' [{details}]' if details else '')
+        )
+
+    def insert_rows(self, model, rows):
+        objects = (model(**values) for values in rows)
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            model.objects.bulk_create(batch)
+            self.stats['loaded'] += len(batch)
+
+    def sync_rows(self, model, rows):
+        """Применяет к таблице только отличия CSV от прошлой загрузки."""
+        update_fields = None
+        seen_ids = set()
+        self.stats.update(inserted=0, updated=0, deleted=0)
+        while True:
+            batch = {
+                int(values['id']): values
+                for values in islice(rows, self.batch_size)
+            }
+            if not batch:
+                break
+            self.stats['loaded'] += len(batch)
+            if self.delete_missing:
+                seen_ids.update(batch)
+            if update_fields is None:
+                update_fields = [
+                    field.attname for field in model._meta.concrete_fields
+                    if field.attname in next(iter(batch.values()))
+                    and not field.primary_key
+                    and not getattr(field, 'auto_now_add', False)
+                ]
+            self.sync_batch(model, batch, update_fields)
+        if self.delete_missing:
+            self.delete_rows(model, seen_ids)
+
+    def sync_batch(self, model, batch, update_fields):
+        label = model._meta.label
+        stored = dict(
+            CsvRowHash.objects.filter(model=label, row_id__in=batch)
+            .values_list('row_id', 'digest')
+        )
+        digests = {}
+        for row_id, values in batch.items():
+            digest = row_digest(values)
+            if stored.get(row_id) != digest:
+                digests[row_id] = digest
+        if not digests:
+            return
+        existing = set(
+            model.objects.filter(pk__in=digests).values_list('pk', flat=True)
+        )
+        if model in PARENT_FIELDS:
+            self.remember_parents(model, batch, digests, existing)
+        model.objects.bulk_create(
+            model(**batch[row_id])
+            for row_id in digests if row_id not in existing
+        )
+        if existing and update_fields:
+            model.objects.bulk_update(
+                [model(**batch[row_id]) for row_id in existing],
+                update_fields
+            )
+        self.sync_authors(model, digests, existing)
+        self.save_digests(label, digests, stored)
+        self.stats['inserted'] += len(digests) - len(existing)
+        self.stats['updated'] += len(existing)
+
+    def remember_parents(self, model, batch, digests, existing):
+        """Запоминает родителей, чьи агрегаты нужно пересчитать.
+
+        bulk-операции обходят сигналы, поддерживающие рейтинг
+        произведений и счётчики комментариев.
+        """
+        field = PARENT_FIELDS[model]
+        parent_ids = (
+            self.rated_title_ids if model is Review
+            else self.commented_review_ids
+        )
+        parent_ids.update(
+            model.objects.filter(pk__in=existing)
+            .values_list(field, flat=True)
+        )
+        parent_ids.update(int(batch[row_id][field]) for row_id in digests)
+
+    def sync_authors(self, model, digests, existing):
+        """Обновляет копии имён авторов только у затронутых строк.
+
+        bulk-операции обходят Model.save и сигнал переименования.
+        """
+        if model in AUTHORED_MODELS:
+            sync_author_usernames(model.objects.filter(pk__in=digests))
+        elif model is User and existing:
+            for authored_model in AUTHORED_MODELS:
+                sync_author_usernames(
+                    authored_model.objects.filter(author_id__in=existing)
+                )
+
+    def save_digests(self, label, digests, stored):
+        CsvRowHash.objects.bulk_create(
+            CsvRowHash(model=label, row_id=row_id, digest=digest)
+            for row_id, digest in digests.items() if row_id not in stored
+        )
+        changed = [row_id for row_id in digests if row_id in stored]
+        if changed:
+            hashes = list(
+                CsvRowHash.objects.filter(model=label, row_id__in=changed)
+            )
+            for row_hash in hashes:
+                row_hash.digest = digests[row_hash.row_id]
+            CsvRowHash.objects.bulk_update(hashes, ['digest'])
+
+    def delete_rows(self, model, seen_ids):
+        """Удаляет ранее загруженные из CSV строки, которых в нём больше нет.
+
+        Объекты, созданные через API, в таблице хешей не числятся
+        и не удаляются.
+        """
+        missing = [
+            row_id for row_id in
+            CsvRowHash.objects.filter(model=model._meta.label)
+            .values_list('row_id', flat=True).iterator()
+            if row_id not in seen_ids
+        ]
+        for start in range(0, len(missing), self.batch_size):
+            chunk = missing[start:start + self.batch_size]
+            model.objects.filter(pk__in=chunk).delete()
+            CsvRowHash.objects.filter(
+                model=model._meta.label, row_id__in=chunk
+            ).delete()
+        self.stats['deleted'] += len(missing)
+
+    def read_rows(self, model, csv_file, columns):
+        """Лениво читает строки CSV как значения атрибутов модели.
+
+        Внешние ключи присваиваются напрямую через *_id, без загрузки
+        связанных объектов из базы.
+        """
+        reader = csv.DictReader(csv_file)
+        attnames = {field.attname: field for field in model._meta.fields}
+        header = [columns.get(column, column) for column in reader.fieldnames]
+        foreign_keys = {
+            attname: field.related_model
+            for attname, field in attnames.items()
+            if attname in header and field.many_to_one
+        }
+        for row in reader:
+            values = {
+                columns.get(column, column): value
+                for column, value in row.items()
+                if columns.get(column, column) in attnames
+            }
+            for attname in foreign_keys:
+                if values[attname] == '':
+                    values[attname] = None
+            if self.check_fk and not all(
+                values[attname] is None
+                or int(values[attname]) in self.get_known_ids(related_model)
+                for attname, related_model in foreign_keys.items()
+            ):
+                self.skipped += 1
+                continue
+            yield values
+
+    def get_known_ids(self, model):
+        if model not in self.known_ids:
+            self.known_ids[model] = set(
+                model.objects.values_list('pk', flat=True).iterator()
+            )
+        return self.known_ids[model]
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+from titles.search import (install_search_index, rebuild_search_index,
+                           search_index_available)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for titles'
+
+    def handle(self, *args, **kwargs):
+        install_search_index()
+        if not search_index_available():
+            raise CommandError('Full-text search requires SQLite with FTS5')
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
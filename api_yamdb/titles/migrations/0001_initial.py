@@ -0,0 +1,100 @@
+# Generated by Django 3.2 on 2026-10-18 03:28
+
+import api.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, verbose_name='Название')),
+                ('slug', models.SlugField(unique=True, verbose_name='slug')),
+            ],
+            options={
+                'verbose_name': 'Категория',
+                'verbose_name_plural': 'Категории',
+                'ordering': ('name',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='CsvRowHash',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='Модель')),
+                ('row_id', models.BigIntegerField(verbose_name='ID строки')),
+                ('digest', models.CharField(max_length=32, verbose_name='Хеш')),
+            ],
+            options={
+                'verbose_name': 'Хеш строки CSV',
+                'verbose_name_plural': 'Хеши строк CSV',
+            },
+        ),
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, verbose_name='Название')),
+                ('slug', models.SlugField(unique=True, verbose_name='slug')),
+            ],
+            options={
+                'verbose_name': 'Жанр',
+                'verbose_name_plural': 'Жанры',
+                'ordering': ('name',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GenreTitle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='titles.genre', verbose_name='Жанр')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Title',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=256, verbose_name='Название')),
+                ('year', models.SmallIntegerField(db_index=True, validators=[api.validators.validate_year], verbose_name='Год выпуска')),
+                ('description', models.TextField(blank=True, verbose_name='Описание')),
+                ('rating_sum', models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок')),
+                ('rating_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок')),
+                ('rating', models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Рейтинг')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='titles', to='titles.category', verbose_name='Категория')),
+                ('genre', models.ManyToManyField(related_name='titles', through='titles.GenreTitle', to='titles.Genre', verbose_name='Жанр')),
+            ],
+            options={
+                'verbose_name': 'Произведение',
+                'verbose_name_plural': 'Произведения',
+                'ordering': ('name',),
+            },
+        ),
+        migrations.AddField(
+            model_name='genretitle',
+            name='title',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='titles.title', verbose_name='Произведение'),
+        ),
+        migrations.AddConstraint(
+            model_name='csvrowhash',
+            constraint=models.UniqueConstraint(fields=('model', 'row_id'), name='unique_csv_row_hash'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'year', 'name'], name='title_category_year_name_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('genre', 'title'), name='unique_genre_title'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+from django.db import DatabaseError, migrations
+
+# Копия схемы из titles.search на момент миграции: правки кода
+# приложения не должны менять уже применённые миграции.
+FTS_TABLE = 'titles_title_fts'
+
+INSTALL_SQL = (
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description,
+        content='titles_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON titles_title BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON titles_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON titles_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+
+def forget_search_index(connection):
+    # Наличие индекса запоминается на соединении, см. titles.search.
+    connection.titles_search_index = None
+
+
+def install(apps, schema_editor):
+    connection = schema_editor.connection
+    forget_search_index(connection)
+    if (connection.vendor != 'sqlite'
+            or FTS_TABLE in connection.introspection.table_names()):
+        return
+    try:
+        with connection.cursor() as cursor:
+            for statement in INSTALL_SQL:
+                cursor.execute(statement)
+            cursor.execute(REBUILD_SQL)
+    except DatabaseError:
+        # SQLite собран без FTS5: поиск работает через icontains.
+        return
+
+
+def uninstall(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}'
+            )
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    forget_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
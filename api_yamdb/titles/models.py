@@ -59,11 +59,33 @@ class Title(models.Model):
         null=True,
         blank=True
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        null=True,
+        blank=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = [
+            models.Index(
+                fields=['category', 'year', 'name'],
+                name='title_category_year_name_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -80,3 +102,38 @@ class GenreTitle(models.Model):
         on_delete=models.CASCADE,
         verbose_name='Произведение'
     )
+
+    class Meta:
+        constraints = [
+            # Уникальный индекс (genre, title) заодно обслуживает фильтр
+            # произведений по жанру.
+            models.UniqueConstraint(
+                fields=['genre', 'title'],
+                name='unique_genre_title'
+            )
+        ]
+
+
+class CsvRowHash(models.Model):
+    """Хеш содержимого строки CSV, загруженной в базу.
+
+    Позволяет при повторной загрузке отличить новые и изменённые строки
+    от уже загруженных без сравнения самих объектов.
+    """
+
+    model = models.CharField(verbose_name='Модель', max_length=100)
+    row_id = models.BigIntegerField(verbose_name='ID строки')
+    digest = models.CharField(verbose_name='Хеш', max_length=32)
+
+    class Meta:
+        verbose_name = 'Хеш строки CSV'
+        verbose_name_plural = 'Хеши строк CSV'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['model', 'row_id'],
+                name='unique_csv_row_hash'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.model}:{self.row_id}'
@@ -0,0 +1,138 @@
+"""Полнотекстовый поиск произведений на основе SQLite FTS5.
+
+Индекс хранится в виртуальной таблице с внешним содержимым
+(content=titles_title), поэтому дублирует только токены, а не тексты.
+Синхронизацию с таблицей произведений выполняют триггеры, так что
+индекс остаётся актуальным и при bulk_create, и при каскадных удалениях.
+"""
+import re
+
+from django.db import (DEFAULT_DB_ALIAS, DatabaseError, connection,
+                       connections)
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'titles_title_fts'
+TOKEN_REGEX = re.compile(r'\w+')
+
+INSTALL_SQL = (
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description,
+        content='titles_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON titles_title BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON titles_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON titles_title BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+MATCH_SQL = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+
+
+def search_index_available(using=DEFAULT_DB_ALIAS):
+    """Проверяет, что индекс установлен в базе данных.
+
+    Схема проверяется один раз на соединение, результат хранится на нём
+    до установки или удаления индекса.
+    """
+    db_connection = connections[using]
+    available = getattr(db_connection, 'titles_search_index', None)
+    if available is None:
+        available = (
+            db_connection.vendor == 'sqlite'
+            and FTS_TABLE in db_connection.introspection.table_names()
+        )
+        db_connection.titles_search_index = available
+    return available
+
+
+def forget_search_index(using=DEFAULT_DB_ALIAS):
+    """Сбрасывает запомненное наличие индекса после изменения схемы."""
+    connections[using].titles_search_index = None
+
+
+def install_search_index(using=DEFAULT_DB_ALIAS):
+    """Создаёт индекс и триггеры, если их ещё нет, и наполняет индекс."""
+    db_connection = connections[using]
+    forget_search_index(using)
+    if (db_connection.vendor != 'sqlite'
+            or FTS_TABLE in db_connection.introspection.table_names()):
+        return
+    try:
+        with db_connection.cursor() as cursor:
+            for statement in INSTALL_SQL:
+                cursor.execute(statement)
+            cursor.execute(REBUILD_SQL)
+    except DatabaseError:
+        # SQLite собран без FTS5: поиск работает через icontains.
+        return
+
+
+def rebuild_search_index():
+    with connection.cursor() as cursor:
+        cursor.execute(REBUILD_SQL)
+
+
+def build_match_query(text, column=None):
+    """Превращает пользовательский ввод в безопасный запрос FTS5.
+
+    Каждое слово ищется по префиксу, все слова должны встретиться.
+    """
+    terms = [f'"{token}"*' for token in TOKEN_REGEX.findall(text)]
+    if not terms:
+        return None
+    query = ' '.join(terms)
+    if column:
+        query = f'{column} : ({query})'
+    return query
+
+
+def search_titles(queryset, text, column=None, ranked=True):
+    """Оставляет в выборке произведения, подходящие под запрос.
+
+    При ranked=True результаты сортируются по релевантности (bm25).
+    """
+    if not search_index_available():
+        columns = (column,) if column else ('name', 'description')
+        condition = Q()
+        for name in columns:
+            condition |= Q(**{f'{name}__icontains': text})
+        return queryset.filter(condition)
+    query = build_match_query(text, column)
+    if query is None:
+        return queryset.none()
+    if not ranked:
+        # Подзапрос по индексу: несколько таких условий в одном запросе
+        # не конфликтуют из-за общей таблицы.
+        return queryset.filter(id__in=RawSQL(MATCH_SQL, (query,)))
+    # Индекс присоединяется один раз: MATCH выполняется одним проходом,
+    # и bm25 считается по разу на найденную строку, а не подзапросом.
+    table = queryset.model._meta.db_table
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {table}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[query],
+        select={'search_rank': f'{FTS_TABLE}.rank'},
+        order_by=['search_rank', 'name', 'id'],
+    )
@@ -1,8 +1,9 @@
+from api.authentication import forget_cached_users
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
-from .models import User
+from .models import QueuedEmail, User
 
 
 @admin.register(User)
@@ -66,7 +67,19 @@ class UserAdmin(BaseUserAdmin):
     @admin.action(description=_('Activate selected users'))
     def activate_users(self, request, queryset):
         queryset.update(is_active=True)
+        forget_cached_users(queryset.values_list('pk', flat=True))
 
     @admin.action(description=_('Deactivate selected users'))
     def deactivate_users(self, request, queryset):
         queryset.update(is_active=False)
+        forget_cached_users(queryset.values_list('pk', flat=True))
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'created_at', 'attempts', 'sent_at'
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
+    readonly_fields = ('created_at',)
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from users.services import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails in batches over one SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Emails sent over one connection.'
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=5,
+            help='Give up on an email after this many failed attempts.'
+        )
+        parser.add_argument(
+            '--backoff', type=float, default=30,
+            help='Retry delay in seconds, doubled after every failure.'
+        )
+        parser.add_argument(
+            '--watch', action='store_true',
+            help='Keep polling the queue instead of exiting when it is empty.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds between polls with --watch.'
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_queued_emails(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+                backoff=options['backoff']
+            )
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                continue
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{total_sent} emails sent, {total_failed} failed'
+        ))
@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 03:57
+
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.text
+import users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_queuedemail'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', users.models.UserManager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('username'), django.db.models.expressions.F('username'), name='user_username_lower_idx'),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as BaseUserManager
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 from api_yamdb import constants
 from .validators import validate_username_not_me
@@ -12,6 +16,28 @@ class UserRole(models.TextChoices):
     ADMIN = 'admin', 'Admin'
 
 
+# Больше любого символа, который может идти после префикса.
+MAX_CHAR = '\U0010ffff'
+
+
+class UserQuerySet(models.QuerySet):
+
+    def username_prefix(self, prefix):
+        """Пользователи, чей username начинается с prefix без учёта регистра.
+
+        Условие записано диапазоном по LOWER(username), поэтому читается
+        по индексу user_username_lower_idx, а не перебором таблицы.
+        """
+        return self.alias(username_lower=Lower('username')).filter(
+            username_lower__gte=Lower(Value(prefix)),
+            username_lower__lt=Lower(Value(prefix + MAX_CHAR))
+        ).order_by(Lower('username'), 'username')
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
+
+
 class User(AbstractUser):
     username_validator = UnicodeUsernameValidator()
     username = models.CharField(
@@ -46,10 +72,19 @@ class User(AbstractUser):
 
     REQUIRED_FIELDS = ['email']
 
+    objects = UserManager()
+
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ['username']
+        indexes = [
+            # Поиск по началу username без учёта регистра.
+            models.Index(
+                Lower('username'), F('username'),
+                name='user_username_lower_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.username
@@ -61,3 +96,56 @@ class User(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == UserRole.MODERATOR
+
+
+class QueuedEmail(models.Model):
+    """Письмо в очереди на отправку.
+
+    Записывается в одной транзакции с изменением, ради которого
+    отправляется, и доставляется командой send_queued_emails.
+    """
+
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    message = models.TextField(verbose_name='Текст')
+    from_email = models.CharField(
+        max_length=constants.LIMIT_EMAIL,
+        verbose_name='Отправитель'
+    )
+    recipient = models.EmailField(
+        max_length=constants.LIMIT_EMAIL,
+        verbose_name='Получатель'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создано'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить не раньше'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки отправки'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Отправлено'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('send_after', 'id')
+        indexes = [
+            # Обработчик выбирает только неотправленные письма.
+            models.Index(
+                fields=['send_after', 'id'],
+                name='queued_email_pending_idx',
+                condition=models.Q(sent_at__isnull=True)
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {self.recipient}'
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+# Пока письмо отправляется, другие обработчики его не выбирают.
+LEASE = timedelta(minutes=5)
+
+
+def queue_email(subject, message, recipient, from_email=None):
+    """Ставит письмо в очередь в текущей транзакции."""
+    return QueuedEmail.objects.create(
+        subject=subject,
+        message=message,
+        recipient=recipient,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL
+    )
+
+
+def claim_emails(batch_size, max_attempts):
+    """Выбирает пачку писем к отправке и откладывает их на время LEASE."""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                sent_at__isnull=True,
+                send_after__lte=now,
+                attempts__lt=max_attempts
+            )[:batch_size]
+        )
+        QueuedEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(send_after=now + LEASE)
+    return emails
+
+
+def send_queued_emails(batch_size=100, max_attempts=5, backoff=30,
+                       connection=None):
+    """Отправляет одну пачку писем через одно SMTP-соединение.
+
+    Неудачная отправка повторяется через backoff * 2 ** (попытка - 1)
+    секунд, после max_attempts попыток письмо остаётся в очереди
+    неотправленным. Возвращает число отправленных и неотправленных писем.
+    """
+    emails = claim_emails(batch_size, max_attempts)
+    if not emails:
+        return 0, 0
+    connection = connection or get_connection()
+    sent, failed = [], []
+    try:
+        for email in emails:
+            email.attempts += 1
+            try:
+                # Открывает соединение, только если оно ещё не открыто.
+                connection.open()
+                connection.send_messages([EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email,
+                    to=[email.recipient]
+                )])
+            except Exception as error:
+                email.last_error = repr(error)
+                email.send_after = timezone.now() + timedelta(
+                    seconds=backoff * 2 ** (email.attempts - 1)
+                )
+                failed.append(email)
+                # После ошибки соединение могло оборваться.
+                connection.close()
+            else:
+                email.sent_at = timezone.now()
+                sent.append(email)
+    finally:
+        connection.close()
+    QueuedEmail.objects.bulk_update(sent, ['attempts', 'sent_at'])
+    QueuedEmail.objects.bulk_update(
+        failed, ['attempts', 'send_after', 'last_error']
+    )
+    return len(sent), len(failed)
@@ -0,0 +1,305 @@
+"""Нагрузочный бенчмарк эндпоинтов API.
+
+Скрипт создаёт отдельную базу SQLite, наполняет её командой
+generate_data и прогоняет каждый маршрут из api/urls.py через
+тестовый клиент Django. Для каждого маршрута считаются перцентили
+задержки, пропускная способность, число SQL-запросов и пиковая память.
+Результаты пишутся в JSON, чтобы сравнивать прогоны между коммитами:
+
+    python benchmarks/bench_api.py --output bench.json
+    python benchmarks/bench_api.py --compare bench.json
+
+Кэш ответов анонимным пользователям выключен, чтобы измерялись сами
+запросы к базе; с --response-cache меряются тёплые попадания в кэш.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = ROOT_DIR / 'api_yamdb'
+DATASETS = {
+    'small': dict(users=200, titles=2000, reviews=20000, comments=20000),
+    'medium': dict(users=2000, titles=20000, reviews=200000,
+                   comments=200000),
+    'large': dict(users=20000, titles=200000, reviews=2000000,
+                  comments=2000000),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--dataset', choices=DATASETS, default='small')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument(
+        '--memory-iterations', type=int, default=5,
+        help='Extra iterations run under tracemalloc to measure peak memory.'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--database',
+        help='SQLite file to reuse between runs (seeded if it is new).'
+    )
+    parser.add_argument(
+        '--response-cache', action='store_true',
+        help='Keep the anonymous response cache on (measures warm hits).'
+    )
+    parser.add_argument('--only', help='Run routes containing this text.')
+    parser.add_argument('--output', help='Write results to this JSON file.')
+    parser.add_argument('--compare', help='Previous JSON results to diff.')
+    return parser.parse_args()
+
+
+def setup_django(database, cache_dir, response_cache=False):
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = database
+    # Свой каталог кэша: общий /tmp хранил бы ответы прошлых прогонов
+    # и работающего рядом сервера.
+    settings.CACHES = {
+        alias: {**config, 'LOCATION': os.path.join(cache_dir, alias)}
+        for alias, config in settings.CACHES.items()
+    }
+    # С кэшем ответов анонимные маршруты меряют попадания в кэш без
+    # SQL-запросов, поэтому по умолчанию он выключен.
+    settings.RESPONSE_CACHE = {
+        **settings.RESPONSE_CACHE, 'ENABLED': response_cache
+    }
+    settings.DEBUG = False
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    # Сотни регистраций подряд упёрлись бы в ограничения частоты.
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}
+    }
+
+    import django
+    django.setup()
+
+
+def seed(args):
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    call_command(
+        'generate_data', seed=args.seed, **DATASETS[args.dataset],
+        stdout=sys.stderr
+    )
+
+
+class Routes:
+    """Набор запросов к каждому маршруту API."""
+
+    def __init__(self):
+        from django.contrib.auth.tokens import default_token_generator
+        from django.test import Client
+        from reviews.models import Comment, Review
+        from rest_framework_simplejwt.tokens import AccessToken
+        from titles.models import Title
+        from users.models import User, UserRole
+
+        self.admin, _ = User.objects.get_or_create(
+            username='bench_admin',
+            defaults={'email': 'bench_admin@yamdb.fake',
+                      'role': UserRole.ADMIN}
+        )
+        self.anonymous = Client()
+        self.client = Client(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.admin)}'
+        )
+        self.title = Title.objects.order_by('-rating_count').first()
+        comment = Comment.objects.select_related('review').first()
+        self.review = comment.review if comment else Review.objects.first()
+        self.confirmation_code = default_token_generator.make_token(
+            self.admin
+        )
+        self.signups = 0
+
+    def items(self):
+        title_id = self.title.pk
+        review_id = self.review.pk
+        title_review_id = self.review.title_id
+        genre = self.title.genre.first()
+        category = self.title.category
+        get = self.anonymous.get
+        yield 'categories list', lambda: get('/api/v1/categories/')
+        yield 'genres list', lambda: get('/api/v1/genres/')
+        yield 'titles list', lambda: get('/api/v1/titles/')
+        yield 'titles list deep page', lambda: get(
+            '/api/v1/titles/', {'page': 200}
+        )
+        yield 'titles list cursor', lambda: get(
+            '/api/v1/titles/', {'pagination': 'cursor'}
+        )
+        yield 'titles detail', lambda: get(f'/api/v1/titles/{title_id}/')
+        if genre:
+            yield 'titles filter genre', lambda: get(
+                '/api/v1/titles/', {'genre': genre.slug}
+            )
+        if category:
+            yield 'titles filter category+year', lambda: get(
+                '/api/v1/titles/',
+                {'category': category.slug, 'year': self.title.year}
+            )
+        yield 'titles filter name', lambda: get(
+            '/api/v1/titles/', {'name': self.title.name.split()[0]}
+        )
+        yield 'titles search', lambda: get(
+            '/api/v1/titles/', {'search': self.title.name.split()[0]}
+        )
+        yield 'reviews list', lambda: get(
+            f'/api/v1/titles/{title_id}/reviews/'
+        )
+        yield 'reviews detail', lambda: get(
+            f'/api/v1/titles/{title_review_id}/reviews/{review_id}/'
+        )
+        yield 'comments list', lambda: get(
+            f'/api/v1/titles/{title_review_id}/reviews/{review_id}/comments/'
+        )
+        yield 'users list', lambda: self.client.get('/api/v1/users/')
+        yield 'users search', lambda: self.client.get(
+            '/api/v1/users/', {'search': 'gen_user_1'}
+        )
+        yield 'users detail', lambda: self.client.get(
+            '/api/v1/users/bench_admin/'
+        )
+        yield 'users me', lambda: self.client.get('/api/v1/users/me/')
+        yield 'auth signup', self.signup
+        yield 'auth token', lambda: self.anonymous.post(
+            '/api/v1/auth/token/',
+            {'username': self.admin.username,
+             'confirmation_code': self.confirmation_code}
+        )
+
+    def signup(self):
+        self.signups += 1
+        username = f'bench_{os.getpid()}_{self.signups}'
+        return self.anonymous.post('/api/v1/auth/signup/', {
+            'username': username, 'email': f'{username}@yamdb.fake'
+        })
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def measure(request, args):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(max(args.warmup, 1)):
+        response = request()
+    if response.status_code >= 400:
+        raise RuntimeError(f'HTTP {response.status_code}: {response.content}')
+    latencies = []
+    queries = []
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        with CaptureQueriesContext(connection) as context:
+            request_started = time.perf_counter()
+            request()
+            latencies.append(time.perf_counter() - request_started)
+        queries.append(len(context.captured_queries))
+    total = time.perf_counter() - started
+    peak = 0
+    tracemalloc.start()
+    for _ in range(args.memory_iterations):
+        tracemalloc.reset_peak()
+        request()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return {
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'throughput_rps': args.iterations / total,
+        'queries': max(queries),
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    header = (f'{"route":32} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} '
+              f'{"req/s":>8} {"queries":>7} {"peak KB":>9}')
+    print(header)
+    print('-' * len(header))
+    for route, stats in results.items():
+        line = (
+            f'{route:32} {stats["p50_ms"]:9.2f} {stats["p95_ms"]:9.2f} '
+            f'{stats["p99_ms"]:9.2f} {stats["throughput_rps"]:8.0f} '
+            f'{stats["queries"]:7d} {stats["peak_memory_kb"]:9.0f}'
+        )
+        previous = (baseline or {}).get(route)
+        if previous:
+            change = stats['p50_ms'] / previous['p50_ms'] - 1
+            line += (f'  p50 {change:+.0%}, queries '
+                     f'{stats["queries"] - previous["queries"]:+d}')
+        print(line)
+
+
+def main():
+    args = parse_args()
+    database = args.database
+    temporary = None
+    if database is None:
+        temporary = tempfile.NamedTemporaryFile(suffix='.sqlite3')
+        database = temporary.name
+    is_new = not os.path.exists(database) or not os.path.getsize(database)
+    cache_dir = tempfile.TemporaryDirectory()
+    setup_django(database, cache_dir.name, args.response_cache)
+    if is_new:
+        seed(args)
+
+    routes = Routes()
+    results = {}
+    for name, request in routes.items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(request, args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['routes']
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({
+                'revision': git_revision(),
+                'dataset': args.dataset,
+                'dataset_size': DATASETS[args.dataset],
+                'iterations': args.iterations,
+                'response_cache': args.response_cache,
+                'python': platform.python_version(),
+                'routes': results,
+            }, file, ensure_ascii=False, indent=2)
+    if temporary is not None:
+        temporary.close()
+    cache_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
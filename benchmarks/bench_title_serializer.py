@@ -0,0 +1,79 @@
+"""Сравнение TitleGETSerializer и быстрой сериализации строк.
+
+Скрипт наполняет временную базу командой generate_data и для страниц
+разного размера замеряет время выборки и сериализации списка
+произведений двумя способами: моделями с TitleGETSerializer и
+кортежами values_list с TitleRowSerializer:
+
+    python benchmarks/bench_title_serializer.py --page-sizes 100 1000
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+
+from bench_api import setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--titles', type=int, default=5000)
+    parser.add_argument(
+        '--page-sizes', type=int, nargs='+', default=[10, 100, 1000]
+    )
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+def model_page(size):
+    from api.serializers import TitleGETSerializer
+    from api.views import TitleViewSet
+
+    page = TitleViewSet.queryset.all()[:size]
+    return TitleGETSerializer(page, many=True).data
+
+
+def fast_page(size):
+    from api.fast_serializers import TitleRowSerializer, title_rows
+    from api.views import TitleViewSet
+
+    page = title_rows(TitleViewSet.queryset.all())[:size]
+    return TitleRowSerializer(page).data
+
+
+def timed(function, size, iterations):
+    function(size)
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        function(size)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations) * 1000
+
+
+def main():
+    args = parse_args()
+    database = tempfile.NamedTemporaryFile(suffix='.sqlite3')
+    setup_django(database.name)
+
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    call_command(
+        'generate_data', seed=args.seed, users=100, titles=args.titles,
+        reviews=args.titles, comments=0, stdout=sys.stderr
+    )
+    print(f'{"page size":>9} {"models ms":>10} {"rows ms":>9} {"speedup":>8}')
+    for size in args.page_sizes:
+        assert [dict(item) for item in model_page(size)] == fast_page(size)
+        model_ms = timed(model_page, size, args.iterations)
+        fast_ms = timed(fast_page, size, args.iterations)
+        print(f'{size:9d} {model_ms:10.2f} {fast_ms:9.2f} '
+              f'{model_ms / fast_ms:7.1f}x')
+    database.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, client, admin_client, admin,
+                                       user_client, user, moderator_client,
+                                       moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения равен средней оценке '
+            'его отзывов.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        response = moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[2]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+        user.delete()
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'каскадном удалении отзывов.'
+        )
+
+        admin.reviews.all().delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Если у произведения не осталось отзывов - значением поля '
+            '`rating` должно быть `None`.'
+        )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    # COUNT(*), страница произведений с категориями, жанры страницы.
+    # Число строк кэшируется, поэтому следующие страницы обходятся без
+    # COUNT(*).
+    LIST_QUERIES = 3
+    # Произведение с категорией, его жанры.
+    DETAIL_QUERIES = 2
+
+    def create_titles(self, admin_client, amount):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        title_ids = []
+        for number in range(amount):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {number}',
+                'year': 2000 + number,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[number % 2]['slug'],
+            })
+            assert response.status_code == HTTPStatus.CREATED
+            title_ids.append(response.json()['id'])
+        return title_ids
+
+    def test_01_title_list_queries(self, client, admin_client,
+                                   django_assert_max_num_queries):
+        self.create_titles(admin_client, 7)
+        for url in (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}?page=2',
+            f'{self.TITLES_URL}?genre=comedy',
+        ):
+            with django_assert_max_num_queries(self.LIST_QUERIES):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+                'со статусом 200.'
+            )
+
+    def test_02_title_detail_queries(self, client, admin_client,
+                                     django_assert_num_queries):
+        title_ids = self.create_titles(admin_client, 2)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_ids[0])
+        with django_assert_num_queries(self.DETAIL_QUERIES):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        assert len(response.json()['genre']) == 3
+
+    def test_03_title_write_queries(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        queries = []
+        for amount in (1, len(genres)):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(self.TITLES_URL, data={
+                    'name': f'Произведение с {amount} жанрами',
+                    'year': 2000,
+                    'genre': [genre['slug'] for genre in genres[:amount]],
+                    'category': categories[0]['slug'],
+                })
+            assert response.status_code == HTTPStatus.CREATED
+            assert len(response.json()['genre']) == amount
+            queries.append(len(context.captured_queries))
+        assert queries[0] == queries[1], (
+            f'Проверьте, что POST-запрос к `{self.TITLES_URL}` выполняет '
+            'одинаковое число запросов к БД независимо от количества жанров.'
+        )
+
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=response.json()['id']
+        )
+        response = admin_client.patch(url, data={'genre': [genres[0]['slug']]})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genre'] == genres[:1]
+        response = admin_client.patch(
+            url, data={'genre': [genres[0]['slug'], 'unknown']}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Если PATCH-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE}` '
+            'содержит несуществующий жанр - должен вернуться ответ со '
+            'статусом 400.'
+        )
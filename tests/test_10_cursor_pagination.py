@@ -0,0 +1,117 @@
+import json
+from base64 import b64encode
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_genre, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def create_titles(self, admin_client, names):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        for name in names:
+            self.create_title(admin_client, name, genres, categories)
+        return genres, categories
+
+    def create_title(self, admin_client, name, genres, categories):
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': name,
+            'year': 2000,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+
+    def walk(self, client, url, key='next'):
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` в курсорном режиме '
+                'возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data
+            pages.append(data['results'])
+            url = data[key]
+        return pages
+
+    def test_01_titles_cursor(self, client, admin_client):
+        names = ['Дюна', 'Дюна', 'Алиса', 'Вий', 'Ревизор', 'Гамлет', 'Нос']
+        genres, categories = self.create_titles(admin_client, names)
+
+        pages = self.walk(client, f'{self.TITLES_URL}?pagination=cursor')
+        assert [len(page) for page in pages] == [5, 2]
+        titles = [title for page in pages for title in page]
+        assert [title['name'] for title in titles] == sorted(names), (
+            f'Проверьте, что в курсорном режиме `{self.TITLES_URL}` '
+            'возвращает произведения по порядку названий без пропусков '
+            'и повторов.'
+        )
+
+        first = client.get(f'{self.TITLES_URL}?pagination=cursor').json()
+        self.create_title(admin_client, 'Аэлита', genres, categories)
+        second = client.get(first['next']).json()
+        assert [title['id'] for title in second['results']] == [
+            title['id'] for title in titles[5:]
+        ], (
+            'Проверьте, что вставка записей перед текущей позицией не '
+            'сдвигает следующую страницу курсорной выдачи.'
+        )
+        previous = client.get(second['previous']).json()
+        assert [title['name'] for title in previous['results']] == [
+            'Аэлита', 'Вий', 'Гамлет', 'Дюна', 'Дюна'
+        ], (
+            'Проверьте, что ссылка `previous` в курсорном режиме ведёт '
+            'на записи, предшествующие текущей странице.'
+        )
+
+    def test_02_invalid_cursor(self, client, admin_client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        self.create_titles(admin_client, ['Терминатор'])
+        title = admin_client.get(self.TITLES_URL).json()['results'][0]
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title['id'])
+        assert client.get(reviews_url).status_code == HTTPStatus.OK
+        for cursor in (
+            [False, ['a', 'x']],
+            [False, [None, None]],
+            [False, [['a'], 1]],
+            [False, ['a']],
+            [False, {'name': 'a'}],
+        ):
+            encoded = b64encode(json.dumps(cursor).encode()).decode()
+            response = client.get(self.TITLES_URL, {'cursor': encoded})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что курсор {cursor} отклоняется ответом со '
+                'статусом 404.'
+            )
+        encoded = b64encode(json.dumps(
+            [False, ['not a date', 1]]
+        ).encode()).decode()
+        response = client.get(reviews_url, {'cursor': encoded})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_reviews_cursor(self, client, admin_client, admin, user,
+                               user_client, moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        pages = self.walk(client, f'{url}?pagination=cursor')
+        assert [review['id'] for page in pages for review in page] == [
+            review['id'] for review in reversed(reviews)
+        ], (
+            f'Проверьте, что в курсорном режиме `{self.REVIEWS_URL_TEMPLATE}` '
+            'возвращает отзывы от новых к старым.'
+        )
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query, param='search'):
+        response = client.get(self.TITLES_URL, {param: query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?{param}=` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, 'терминат') == [titles[0]['name']], (
+            'Проверьте, что поиск находит произведения по началу слова '
+            'в названии без учёта регистра.'
+        )
+        assert self.search(client, 'yippie') == [titles[1]['name']], (
+            'Проверьте, что поиск находит произведения по описанию.'
+        )
+        assert self.search(client, 'back "terminator') == [], (
+            'Проверьте, что в результатах поиска есть только произведения, '
+            'содержащие все слова запроса.'
+        )
+        assert self.search(client, '*()"') == []
+
+    def test_02_search_ranking(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'description': 'Орешек, орешек и ещё раз орешек'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(client, 'орешек') == [
+            titles[0]['name'], titles[1]['name']
+        ], (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+    def test_03_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = admin_client.patch(url, data={'name': 'Чужой'})
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(client, 'чужой', 'name') == ['Чужой']
+        assert self.search(client, 'терминатор', 'name') == [], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'названия произведения.'
+        )
+        admin_client.delete(url)
+        assert self.search(client, 'чужой') == [], (
+            'Проверьте, что удалённые произведения пропадают из поиска.'
+        )
+
+    def test_04_name_and_search_combined(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(
+            self.TITLES_URL, {'name': 'крепкий', 'search': 'yippie'}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что параметры `name` и `search` можно использовать '
+            'в одном запросе.'
+        )
+        assert [
+            title['name'] for title in response.json()['results']
+        ] == [titles[1]['name']]
+        response = client.get(
+            self.TITLES_URL, {'name': 'терминатор', 'search': 'yippie'}
+        )
+        assert response.json()['results'] == []
+
+    def test_05_index_check_not_repeated(self, admin_client):
+        create_titles(admin_client)
+        admin_client.get(self.TITLES_URL, {'search': 'терминатор'})
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get(self.TITLES_URL, {'search': 'орешек'})
+        assert not any(
+            'sqlite_master' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что наличие поискового индекса не проверяется на '
+            'каждый запрос.'
+        )
+
+    def test_06_ranked_search_single_match(self, client, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.TITLES_URL, {'search': 'орешек'})
+        matches = [
+            query['sql'] for query in context.captured_queries
+            if 'MATCH' in query['sql']
+        ]
+        assert matches and all(
+            sql.count('MATCH') == 1 for sql in matches
+        ), (
+            'Проверьте, что поиск с сортировкой по релевантности выполняет '
+            'MATCH по индексу один раз на запрос, а не для каждой '
+            f'найденной строки. Выполненные запросы: {matches}'
+        )
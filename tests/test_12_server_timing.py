@@ -0,0 +1,62 @@
+import json
+import logging
+import re
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ServerTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+    TIMING_REGEX = re.compile(r'^(\w+);dur=\d+\.\d(;desc="(\d+) queries")?$')
+
+    def parse(self, header):
+        metrics = {}
+        for entry in header.split(', '):
+            match = self.TIMING_REGEX.match(entry)
+            assert match, (
+                f'Запись `{entry}` заголовка Server-Timing имеет неверный '
+                'формат.'
+            )
+            metrics[match.group(1)] = match.group(3)
+        return metrics
+
+    def test_01_header(self, client, admin_client, settings):
+        settings.SERVER_TIMING = {'SAMPLE_RATE': 1.0}
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('Server-Timing'), (
+            'Проверьте, что ответ содержит заголовок Server-Timing.'
+        )
+        metrics = self.parse(response['Server-Timing'])
+        assert set(metrics) == {'total', 'db', 'view', 'render'}
+        assert metrics['db'] == '3', (
+            'Проверьте, что в заголовке Server-Timing указано число '
+            'SQL-запросов.'
+        )
+
+    def test_02_sampling_and_slow_log(self, client, settings, caplog):
+        settings.SERVER_TIMING = {'SAMPLE_RATE': 0.0, 'SLOW_REQUEST_MS': 0}
+        with caplog.at_level(logging.WARNING, 'api_yamdb.performance'):
+            response = client.get(self.TITLES_URL)
+        assert not response.has_header('Server-Timing'), (
+            'Заголовок Server-Timing не должен добавляться к запросам, '
+            'не попавшим в выборку.'
+        )
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['event'] == 'slow_request'
+        assert record['path'] == self.TITLES_URL
+        assert record['status'] == HTTPStatus.OK
+
+        settings.SERVER_TIMING = {'ENABLED': False, 'SLOW_REQUEST_MS': 0}
+        caplog.clear()
+        response = client.get(self.TITLES_URL)
+        assert not response.has_header('Server-Timing')
+        assert not caplog.records, (
+            'Отключённый замер времени не должен писать в лог.'
+        )
@@ -0,0 +1,88 @@
+import stat
+import tempfile
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    CATEGORY_URL = '/api/v1/categories/'
+
+    def test_01_anonymous_reads_cached(self, client, admin_client,
+                                       django_assert_num_queries):
+        create_titles(admin_client)
+        url = f'{self.TITLES_URL}?year=1984&category=films'
+        first = client.get(url)
+        assert first.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            second = client.get(f'{self.TITLES_URL}?category=films&year=1984')
+        assert second.status_code == HTTPStatus.OK
+        assert second.json() == first.json(), (
+            'Проверьте, что повторный анонимный GET-запрос к '
+            f'`{self.TITLES_URL}` отдаётся из кэша без запросов к БД.'
+        )
+        client.get(self.CATEGORY_URL)
+        with django_assert_num_queries(0):
+            client.get(self.CATEGORY_URL)
+
+    def test_02_authenticated_reads_not_cached(self, admin_client,
+                                               django_assert_num_queries):
+        create_titles(admin_client)
+        admin_client.get(self.TITLES_URL)
+        # Страница и жанры; пользователь и число строк закэшированы.
+        with django_assert_num_queries(2):
+            response = admin_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_invalidation(self, client, admin_client, user_client):
+        titles, categories, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert client.get(url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        assert client.get(url).json()['rating'] == 9, (
+            'Проверьте, что кэш ответа сбрасывается при добавлении отзыва.'
+        )
+
+        admin_client.patch(url, data={'name': 'Терминатор 2'})
+        assert client.get(url).json()['name'] == 'Терминатор 2', (
+            'Проверьте, что кэш ответа сбрасывается при изменении '
+            'произведения.'
+        )
+
+        assert len(client.get(self.CATEGORY_URL).json()['results']) == 2
+        admin_client.delete(f'{self.CATEGORY_URL}{categories[1]["slug"]}/')
+        assert len(client.get(self.CATEGORY_URL).json()['results']) == 1, (
+            'Проверьте, что кэш списка категорий сбрасывается при удалении '
+            'категории.'
+        )
+        assert client.get(url).json()['category'] == categories[0]
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        assert client.get(title_url).json()['category'] is None, (
+            'Проверьте, что кэш произведений сбрасывается при удалении '
+            'их категории.'
+        )
+
+    def test_04_private_cache_dir(self):
+        cache_dir = Path(settings.CACHE_DIR)
+        assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700, (
+            'Проверьте, что каталог файловых кэшей доступен только '
+            'владельцу процесса.'
+        )
+        for config in settings.CACHES.values():
+            location = Path(config['LOCATION'])
+            assert cache_dir in location.parents
+            assert location.parent != Path(tempfile.gettempdir()), (
+                'Проверьте, что файловые кэши не лежат в общем каталоге '
+                'временных файлов.'
+            )
@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_not_modified(self, client, url, django_assert_num_queries,
+                           **headers):
+        with django_assert_num_queries(0):
+            response = client.get(url, **headers)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальными '
+            'валидаторами возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        return response
+
+    def test_01_validators(self, client, admin_client,
+                           django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        urls = (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.has_header('ETag'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок ETag.'
+            )
+            assert response.has_header('Last-Modified'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок Last-Modified.'
+            )
+            not_modified = self.check_not_modified(
+                client, url, django_assert_num_queries,
+                HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            assert not_modified['ETag'] == response['ETag']
+            self.check_not_modified(
+                client, url, django_assert_num_queries,
+                HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+        etag = client.get(urls[0])['ETag']
+        assert client.get(f'{urls[0]}?year=1984')['ETag'] != etag, (
+            'Проверьте, что ETag зависит от параметров запроса.'
+        )
+        response = admin_client.get(urls[0], HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что ETag не зависит от пользователя.'
+        )
+
+    def test_02_changes(self, client, admin_client, user_client,
+                        moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        other_reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        etag = client.get(reviews_url)['ETag']
+        other_etag = client.get(other_reviews_url)['ETag']
+
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отлично', 9
+        ).json()
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка отзывов меняется при добавлении '
+            'отзыва.'
+        )
+        assert response.json()['count'] == 1
+        response = client.get(other_reviews_url, HTTP_IF_NONE_MATCH=other_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что отзыв на одно произведение не меняет ETag '
+            'списка отзывов на другое произведение.'
+        )
+
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=review['id']
+        )
+        etag = client.get(comments_url)['ETag']
+        create_single_comment(
+            moderator_client, titles[0]['id'], review['id'], 'Согласен'
+        )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка комментариев меняется при '
+            'добавлении комментария.'
+        )
+        etag = response['ETag']
+
+        admin_client.delete(f'{reviews_url}{review["id"]}/')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после удаления отзыва его комментарии '
+            'недоступны.'
+        )
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from titles.models import Title
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15SparseFieldsets:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_titles(self, admin_client, django_assert_num_queries,
+                       django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        # COUNT(*) и страница без жанров; пользователь из кэша.
+        with django_assert_num_queries(2) as context:
+            response = admin_client.get(
+                self.TITLES_URL, {'fields': 'id,name,rating'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                f'Проверьте, что параметр `fields` запроса к '
+                f'`{self.TITLES_URL}` оставляет в ответе только '
+                'перечисленные поля.'
+            )
+        page_sql = context.captured_queries[-1]['sql']
+        assert 'description' not in page_sql and 'JOIN' not in page_sql, (
+            'Проверьте, что параметр `fields` сужает SQL-запрос: '
+            'невыводимые столбцы и связи не должны загружаться.'
+        )
+
+        response = admin_client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            {'omit': 'description,genre'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'rating', 'reviews_count', 'category'
+        }, (
+            'Проверьте, что параметр `omit` убирает из ответа перечисленные '
+            'поля.'
+        )
+        assert response.json()['category']['slug'] == titles[0]['category']
+
+        Title.objects.bulk_create(
+            Title(name=f'Фильм {number}', year=2000) for number in range(5)
+        )
+        # Пользователь из токена и страница: поля сортировки для курсора
+        # не должны догружаться отдельными запросами.
+        with django_assert_max_num_queries(2):
+            response = admin_client.get(
+                self.TITLES_URL, {'fields': 'id', 'pagination': 'cursor'}
+            )
+        assert response.json()['next']
+
+    def test_02_reviews_and_users(self, admin_client, admin, user, moderator,
+                                  user_client, moderator_client):
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = admin_client.get(url, {'fields': 'id,score,author'})
+        assert response.status_code == HTTPStatus.OK
+        assert sorted(
+            response.json()['results'], key=lambda review: review['id']
+        ) == sorted(
+            ({key: review[key] for key in ('id', 'score', 'author')}
+             for review in reviews),
+            key=lambda review: review['id']
+        )
+
+        response = admin_client.get(self.USERS_URL, {'omit': 'bio,role'})
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()['results'][0]) == {
+            'username', 'email', 'first_name', 'last_name'
+        }
+
+    def test_03_unknown_field(self, client, admin_client):
+        response = client.get(self.TITLES_URL, {'fields': 'id,password'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестного поля в параметре `fields` '
+            'возвращает ответ со статусом 400.'
+        )
+        response = admin_client.post(
+            '/api/v1/categories/?fields=slug',
+            data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.json() == {'name': 'Фильм', 'slug': 'films'}, (
+            'Параметр `fields` не должен влиять на запросы на запись.'
+        )
@@ -0,0 +1,64 @@
+import pytest
+from api.views import TitleViewSet
+from titles.models import Category, Genre, Title
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16FastTitleSerializer:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_catalog(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 8)
+        category = Category.objects.create(name='Журнал', slug='magazines')
+        genres = [
+            Genre.objects.create(name='Фантастика', slug='sci-fi'),
+            Genre.objects.create(name='Антиутопия', slug='dystopia'),
+        ]
+        for number in range(6):
+            title = Title.objects.create(
+                name=f'Книга {number}', year=1950 + number,
+                category=category if number % 2 else None
+            )
+            title.genre.set(genres[:number % 3])
+
+    def test_01_parity(self, client, admin_client, user_client, monkeypatch):
+        self.create_catalog(admin_client, user_client)
+        requests = (
+            {},
+            {'page': 2},
+            {'pagination': 'cursor'},
+            {'category': 'magazines'},
+            {'search': 'Книга'},
+            {'fields': 'id,name,rating'},
+            {'omit': 'description,category'},
+        )
+        for params in requests:
+            monkeypatch.setattr(TitleViewSet, 'fast_list', False)
+            expected = admin_client.get(self.TITLES_URL, params).json()
+            monkeypatch.setattr(TitleViewSet, 'fast_list', True)
+            response = admin_client.get(self.TITLES_URL, params)
+            assert response.json() == expected, (
+                'Проверьте, что быстрая сериализация списка произведений '
+                f'с параметрами {params} совпадает с TitleGETSerializer.'
+            )
+        cursor_page = client.get(
+            self.TITLES_URL, {'pagination': 'cursor'}
+        ).json()
+        assert client.get(cursor_page['next']).json()['results'], (
+            'Проверьте, что курсорная пагинация работает с быстрой '
+            'сериализацией.'
+        )
+
+    def test_02_queries(self, admin_client, user_client,
+                        django_assert_num_queries):
+        self.create_catalog(admin_client, user_client)
+        # COUNT(*), страница, жанры страницы; пользователь из токена
+        # берётся из кэша аутентификации.
+        with django_assert_num_queries(3):
+            admin_client.get(self.TITLES_URL)
+        with django_assert_num_queries(2):
+            admin_client.get(self.TITLES_URL, {'fields': 'name,category'})
@@ -0,0 +1,68 @@
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Comment
+from titles.models import GenreTitle
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17QueryPlans:
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def page_plan(self, client, url, table):
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        for query in context.captured_queries:
+            sql = query['sql']
+            if sql.startswith('SELECT') and f'FROM "{table}"' in sql and (
+                    'LIMIT' in sql):
+                return self.explain(sql)
+        raise AssertionError(
+            f'Не найден запрос страницы к таблице {table} для `{url}`.'
+        )
+
+    def test_01_list_endpoints_use_indexes(self, admin_client, user, moderator,
+                                           user_client, moderator_client):
+        create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        comment = Comment.objects.select_related('review').first()
+        title_id, review_id = comment.review.title_id, comment.review_id
+        cases = (
+            ('/api/v1/titles/', 'titles_title', 'titles_title_name_'),
+            ('/api/v1/titles/?category=films&year=1984', 'titles_title',
+             'title_category_year_name_idx'),
+            ('/api/v1/titles/?genre=drama', 'titles_title',
+             'sqlite_autoindex_titles_genretitle'),
+            (f'/api/v1/titles/{title_id}/reviews/', 'reviews_review',
+             'review_title_pub_date_idx'),
+            (f'/api/v1/titles/{title_id}/reviews/?pagination=cursor',
+             'reviews_review', 'review_title_pub_date_idx'),
+            (f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+             'reviews_comment', 'comment_review_pub_date_idx'),
+        )
+        for url, table, index in cases:
+            plan = self.page_plan(admin_client, url, table)
+            assert any(f'INDEX {index}' in step for step in plan), (
+                f'Проверьте, что запрос страницы `{url}` использует индекс '
+                f'{index}. План запроса: {plan}'
+            )
+            if table != 'titles_title' or '?' not in url:
+                assert not any('TEMP B-TREE' in step for step in plan), (
+                    f'Проверьте, что сортировка страницы `{url}` берётся из '
+                    f'индекса без отдельной сортировки. План: {plan}'
+                )
+
+    def test_02_unique_genre_title(self, admin_client, user, user_client):
+        create_comments(admin_client, {user: user_client})
+        link = GenreTitle.objects.first()
+        with pytest.raises(IntegrityError), transaction.atomic():
+            GenreTitle.objects.create(
+                genre_id=link.genre_id, title_id=link.title_id
+            )
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что фильтр {params} принимается эндпоинтом '
+            f'`{self.TITLES_URL}`.'
+        )
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_multi_value_filters(self, client, admin_client):
+        # Терминатор: horror, comedy, films, 1984;
+        # Крепкий орешек: drama, books, 1988.
+        create_titles(admin_client)
+        cases = (
+            ({'genre': 'horror,drama'}, ['Крепкий орешек', 'Терминатор']),
+            ({'genre': 'horror,comedy'}, ['Терминатор']),
+            ({'genre': 'horror,comedy', 'genre_match': 'all'},
+             ['Терминатор']),
+            ({'genre': 'horror,drama', 'genre_match': 'all'}, []),
+            ({'genre': 'drama,unknown', 'genre_match': 'any'},
+             ['Крепкий орешек']),
+            ({'category': 'films,books'}, ['Крепкий орешек', 'Терминатор']),
+            ({'category': 'books'}, ['Крепкий орешек']),
+            ({'year_min': 1985}, ['Крепкий орешек']),
+            ({'year_max': 1985}, ['Терминатор']),
+            ({'year_min': 1980, 'year_max': 1990, 'genre': 'comedy,drama',
+              'category': 'books'}, ['Крепкий орешек']),
+        )
+        for params, expected in cases:
+            assert self.names(client, params) == expected, (
+                f'Проверьте работу фильтра {params} для эндпоинта '
+                f'`{self.TITLES_URL}`.'
+            )
+        response = client.get(self.TITLES_URL, {'genre_match': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_filters_use_subqueries(self, client, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            client.get(
+                self.TITLES_URL,
+                {'genre': 'horror,comedy,drama', 'category': 'films,books'}
+            )
+        page_sql = next(
+            query['sql'] for query in context.captured_queries
+            if 'LIMIT' in query['sql']
+        )
+        assert 'EXISTS' in page_sql and 'DISTINCT' not in page_sql, (
+            'Проверьте, что фильтр по жанрам выполняется подзапросом '
+            'EXISTS без DISTINCT.'
+        )
+        assert 'JOIN "titles_genretitle"' not in page_sql
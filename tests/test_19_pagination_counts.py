@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19PaginationCounts:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def get(self, client, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        count_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(*)' in query['sql']
+        ]
+        return response.json(), count_queries
+
+    def test_01_skip_count(self, admin_client, user_client):
+        _, categories, genres = create_titles(admin_client)
+        for number in range(5):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Фильм {number}', 'year': 2000 + number,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            })
+        data, count_queries = self.get(
+            user_client, self.TITLES_URL, {'count': 'false'}
+        )
+        assert not count_queries, (
+            'Проверьте, что с параметром `count=false` число записей не '
+            'считается.'
+        )
+        assert 'count' not in data
+        assert len(data['results']) == 5
+        assert data['previous'] is None
+        assert data['next'].endswith('page=2')
+        second, _ = self.get(user_client, data['next'])
+        assert len(second['results']) == 2
+        assert second['next'] is None
+        assert 'page=' not in second['previous']
+        response = user_client.get(
+            self.TITLES_URL, {'count': 'false', 'page': 3}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_cached_count(self, admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        params = {'genre': genres[0]['slug']}
+        data, count_queries = self.get(user_client, self.TITLES_URL, params)
+        assert data['count'] == 1 and len(count_queries) == 1
+        data, count_queries = self.get(
+            user_client, self.TITLES_URL, {**params, 'page': 1}
+        )
+        assert data['count'] == 1 and not count_queries, (
+            'Проверьте, что число записей для одинаковых фильтров берётся '
+            'из кэша.'
+        )
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'genre': [genres[0]['slug']]}
+        )
+        data, count_queries = self.get(user_client, self.TITLES_URL, params)
+        assert data['count'] == 2, (
+            'Проверьте, что закэшированное число записей сбрасывается при '
+            'изменении данных.'
+        )
+
+    def test_03_review_count_from_counter(self, admin_client, user, moderator,
+                                          user_client, moderator_client):
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data, count_queries = self.get(user_client, url)
+        assert data['count'] == 2
+        assert not count_queries, (
+            'Проверьте, что число отзывов на произведение берётся из '
+            'счётчика без COUNT(*).'
+        )
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        data, _ = self.get(user_client, url)
+        assert data['count'] == 1
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE', 'ROLLBACK')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20NestedParents:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def post(self, client, url, data):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data=data)
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(TRANSACTION_STATEMENTS)
+        ]
+        return response, queries
+
+    def test_01_review_create_queries(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отлично', 'score': 9}
+        response, queries = self.post(user_client, url, data)
+        assert response.status_code == HTTPStatus.CREATED
+        # Пользователь из токена, произведение, вставка отзыва и два
+        # обновления агрегатов рейтинга.
+        assert len(queries) == 5, (
+            'Проверьте, что при создании отзыва произведение ищется один '
+            'раз, а повторный отзыв не проверяется отдельным запросом. '
+            f'Выполненные запросы: {queries}'
+        )
+        assert sum('FROM "titles_title"' in sql for sql in queries) == 1
+
+        response, _ = self.post(user_client, url, data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв того же автора на то же '
+            'произведение возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставили отзыв на это произведение.']
+        }
+
+    def test_02_comment_create_queries(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'text': 'Отлично', 'score': 9}
+        ).json()
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=review['id']
+        )
+        response, queries = self.post(
+            user_client, url, {'text': 'Согласен'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert sum('FROM "reviews_review"' in sql for sql in queries) == 1, (
+            'Проверьте, что отзыв при создании комментария ищется один раз.'
+        )
+
+        wrong_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=review['id']
+        )
+        response, _ = self.post(user_client, wrong_url, {'text': 'Согласен'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,121 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Comment, Review
+from titles.models import Title
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Counters:
+
+    TITLE_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+    def test_01_counters_in_api(self, client, admin_client, user, moderator,
+                                user_client, moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_url = self.TITLE_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review_url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(title_url).json()['reviews_count'] == 2, (
+            'Проверьте, что ответ для произведения содержит число отзывов '
+            'в поле `reviews_count`.'
+        )
+        assert client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        ).json()['results'][-1]['comments_count'] == 2, (
+            'Проверьте, что список отзывов показывает актуальное число '
+            'комментариев.'
+        )
+
+        admin_client.delete(f'{review_url}comments/{comments[0]["id"]}/')
+        assert client.get(review_url).json()['comments_count'] == 1, (
+            'Проверьте, что счётчик комментариев уменьшается при удалении '
+            'комментария.'
+        )
+        admin_client.delete(review_url)
+        assert client.get(title_url).json()['reviews_count'] == 1
+
+    def test_02_comment_count_from_counter(self, admin_client, user,
+                                           moderator, user_client,
+                                           moderator_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        ) + 'comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 2
+        assert not any(
+            'COUNT(*)' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что число комментариев к отзыву берётся из '
+            'счётчика без COUNT(*).'
+        )
+
+    def test_03_reconcile_counters(self, admin_client, user, moderator,
+                                   user_client, moderator_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        Review.objects.update(comments_count=10)
+        Title.objects.filter(pk=titles[0]['id']).update(rating_count=7)
+
+        out = StringIO()
+        call_command('reconcile_counters', '--dry-run', stdout=out)
+        assert 'reviews.Review: 2 drifted rows' in out.getvalue()
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 10
+
+        call_command('reconcile_counters', stdout=StringIO())
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 2
+        assert Review.objects.get(pk=reviews[1]['id']).comments_count == 0
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_count, title.rating) == (2, 5), (
+            'Проверьте, что команда `reconcile_counters` исправляет '
+            'расхождения счётчиков.'
+        )
+
+    def test_04_cascade_without_review_lookups(self, client, admin_client,
+                                               admin, user, moderator,
+                                               user_client, moderator_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        for number in range(10):
+            Comment.objects.create(
+                review_id=reviews[0]['id'], author=admin, text=str(number)
+            )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert client.get(reviews_url).json()['count'] == 2
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.delete(
+                self.REVIEW_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=reviews[0]['id']
+                )
+            )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        lookups = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_review"."title_id"')
+        ]
+        assert len(lookups) <= 1, (
+            'Проверьте, что при каскадном удалении комментариев '
+            'произведение отзыва не запрашивается для каждого комментария.'
+        )
+        assert client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что кэш списка отзывов сбрасывается при удалении '
+            'отзыва с комментариями.'
+        )
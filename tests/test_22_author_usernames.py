@@ -0,0 +1,130 @@
+import shutil
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from reviews.models import Comment, Review
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22AuthorUsernames:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def urls(self, titles, reviews):
+        return (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+        )
+
+    def test_01_authors_without_per_row_queries(self, admin_client, user,
+                                                moderator, user_client,
+                                                moderator_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        for url in self.urls(titles, reviews):
+            data, queries = self.get(user_client, url)
+            assert {item['author'] for item in data['results']} == {
+                user.username, moderator.username
+            }
+            user_queries = [
+                sql for sql in queries if 'FROM "users_user"' in sql
+            ]
+            # Пользователь из токена берётся из кэша аутентификации.
+            assert not user_queries, (
+                f'Проверьте, что авторы в ответе на GET-запрос к `{url}` '
+                'загружаются вместе со страницей, а не отдельным запросом '
+                f'на каждую строку. Выполненные запросы: {queries}'
+            )
+
+    def test_02_denormalized_username(self, settings, client, admin_client,
+                                      user, moderator, user_client,
+                                      moderator_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        assert set(
+            Comment.objects.values_list('author_username', flat=True)
+        ) == {user.username, moderator.username}
+
+        settings.DENORMALIZED_AUTHOR_USERNAME = True
+        for url in self.urls(titles, reviews):
+            data, queries = self.get(client, url)
+            assert {item['author'] for item in data['results']} == {
+                user.username, moderator.username
+            }
+            assert not any('users_user' in sql for sql in queries), (
+                'Проверьте, что при DENORMALIZED_AUTHOR_USERNAME имя автора '
+                f'для `{url}` читается без обращения к таблице пользователей.'
+            )
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(
+            Review.objects.filter(author=user)
+            .values_list('author_username', flat=True)
+        ) == {'renamed'}, (
+            'Проверьте, что при переименовании пользователя имя обновляется '
+            'во всех его отзывах и комментариях.'
+        )
+        data, _ = self.get(client, self.urls(titles, reviews)[1])
+        assert 'renamed' in {item['author'] for item in data['results']}
+
+    def test_03_incremental_load_syncs_touched_rows(self, tmp_path):
+        shutil.copytree(
+            django_settings.BASE_DIR / 'static' / 'data', tmp_path,
+            dirs_exist_ok=True
+        )
+        load = ['load_csv_data', '--path', str(tmp_path), '--incremental']
+        call_command(*load, stdout=StringIO())
+        assert set(
+            Review.objects.filter(author_id=101)
+            .values_list('author_username', flat=True)
+        ) == {'capt_obvious'}
+
+        untouched = Review.objects.exclude(author_id=101).first()
+        Review.objects.filter(pk=untouched.pk).update(author_username='old')
+        users_csv = tmp_path / 'users.csv'
+        users_csv.write_text(
+            users_csv.read_text(encoding='utf-8').replace(
+                '101,capt_obvious,', '101,renamed,'
+            ),
+            encoding='utf-8'
+        )
+        call_command(*load, stdout=StringIO())
+        for model in (Review, Comment):
+            assert set(
+                model.objects.filter(author_id=101)
+                .values_list('author_username', flat=True)
+            ) == {'renamed'}, (
+                'Проверьте, что инкрементальная загрузка обновляет имя '
+                'автора у строк переименованного пользователя.'
+            )
+        assert Review.objects.get(
+            pk=untouched.pk
+        ).author_username == 'old', (
+            'Проверьте, что инкрементальная загрузка обновляет имена '
+            'авторов только у строк, затронутых этой загрузкой.'
+        )
@@ -0,0 +1,71 @@
+from hashlib import sha256
+from http import HTTPStatus
+
+import pytest
+from api.authentication import token_cache, user_cache_key
+from django.core.cache import cache
+
+ME_URL = '/api/v1/users/me/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23AuthCache:
+
+    def test_01_cached_token_and_user(self, user, user_client, token_user,
+                                      django_assert_num_queries):
+        assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        key = sha256(token_user['access'].encode()).hexdigest()
+        assert token_cache.get(key) is not None, (
+            'Проверьте, что проверенный токен запоминается в кэше.'
+        )
+        # Профиль в ответе догружается одним запросом без пользователя
+        # для аутентификации.
+        with django_assert_num_queries(1):
+            response = user_client.get(ME_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что повторный запрос с тем же токеном не загружает '
+            'пользователя для аутентификации из базы.'
+        )
+        assert response.json()['email'] == user.email
+
+    def test_02_no_secrets_in_shared_cache(self, user, user_client):
+        assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        cached = cache.get(user_cache_key(user.pk))
+        assert cached is not None
+        assert not {'password', 'email'} & set(cached), (
+            'Проверьте, что в общий кэш не попадают хеш пароля и личные '
+            'данные пользователя.'
+        )
+        email, password = user.email, user.password
+        response = user_client.patch(ME_URL, data={'bio': 'Обо мне'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert (user.bio, user.email, user.password) == (
+            'Обо мне', email, password
+        ), (
+            'Проверьте, что изменение профиля пользователя из кэша не '
+            'затирает остальные его поля.'
+        )
+
+    def test_03_invalidation(self, admin_client, user, user_client):
+        assert user_client.get(ME_URL).json()['role'] == 'user'
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert user_client.get(ME_URL).json()['role'] == 'moderator', (
+            'Проверьте, что смена роли пользователя сбрасывает его кэш.'
+        )
+
+        user.refresh_from_db()
+        user.is_active = False
+        user.save()
+        assert user_client.get(ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что заблокированный пользователь не аутентифицируется.'
+
+    def test_04_deleted_user(self, admin_client, user, user_client):
+        assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert user_client.get(ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что удалённый пользователь не аутентифицируется.'
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+from users.models import QueuedEmail
+from users.services import queue_email, send_queued_emails
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+
+
+class CountingBackend(EmailBackend):
+    """Считает открытия соединения и не отправляет письма на fail_for."""
+
+    def __init__(self, fail_for=(), **kwargs):
+        super().__init__(**kwargs)
+        self.fail_for = set(fail_for)
+        self.opened = 0
+        self.is_open = False
+
+    def open(self):
+        if self.is_open:
+            return False
+        self.opened += 1
+        self.is_open = True
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.fail_for & set(message.to):
+                raise ConnectionError('SMTP недоступен')
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24EmailOutbox:
+
+    def test_01_signup_queues_email(self, client):
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post(URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert not mail.outbox, (
+            'Проверьте, что при регистрации письмо не отправляется во '
+            'время запроса.'
+        )
+        email = QueuedEmail.objects.get()
+        assert email.recipient == data['email'] and email.sent_at is None
+
+        call_command('send_queued_emails', stdout=StringIO())
+        assert [message.to for message in mail.outbox] == [[data['email']]]
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 1
+
+    def test_02_batches_over_one_connection(self):
+        for number in range(5):
+            queue_email('Тема', 'Текст', f'user{number}@yamdb.fake')
+        backend = CountingBackend()
+        assert send_queued_emails(connection=backend) == (5, 0)
+        assert backend.opened == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+        assert len(mail.outbox) == 5
+        assert send_queued_emails(connection=backend) == (0, 0)
+
+    def test_03_retries_with_backoff(self):
+        queue_email('Тема', 'Текст', 'broken@yamdb.fake')
+        queue_email('Тема', 'Текст', 'ok@yamdb.fake')
+        backend = CountingBackend(fail_for=['broken@yamdb.fake'])
+        started = timezone.now()
+        assert send_queued_emails(
+            connection=backend, backoff=60
+        ) == (1, 1)
+        broken = QueuedEmail.objects.get(recipient='broken@yamdb.fake')
+        assert broken.attempts == 1 and broken.sent_at is None
+        assert 'SMTP недоступен' in broken.last_error
+        assert broken.send_after >= started + timedelta(seconds=60)
+        assert send_queued_emails(connection=backend) == (0, 0), (
+            'Проверьте, что неотправленное письмо повторяется не раньше '
+            'окончания паузы.'
+        )
+
+        QueuedEmail.objects.update(send_after=timezone.now())
+        send_queued_emails(connection=backend, backoff=60)
+        broken.refresh_from_db()
+        assert broken.attempts == 2
+        assert broken.send_after >= timezone.now() + timedelta(seconds=110)
+
+        QueuedEmail.objects.update(send_after=timezone.now())
+        assert send_queued_emails(
+            connection=backend, max_attempts=2
+        ) == (0, 0), (
+            'Проверьте, что после max_attempts попыток письмо больше не '
+            'отправляется.'
+        )
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from api.serializers import SignUpSerializer
+from api.views import SignUpView
+from rest_framework.test import APIClient
+from users.models import QueuedEmail, User
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE', 'ROLLBACK')
+
+
+def signup(data):
+    try:
+        return APIClient().post(URL_SIGNUP, data=data).status_code
+    finally:
+        connection.close()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SignupQueries:
+
+    def test_01_single_lookup(self, client):
+        data = {'email': 'single@yamdb.fake', 'username': 'single'}
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(TRANSACTION_STATEMENTS)
+        ]
+        # Поиск владельцев email и username, вставка пользователя и письма.
+        assert len(queries) == 3, (
+            'Проверьте, что при регистрации занятость email и username '
+            f'проверяется одним запросом. Выполненные запросы: {queries}'
+        )
+        assert ' OR ' in queries[0]
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert sum(
+            'FROM "users_user"' in query['sql']
+            for query in context.captured_queries
+        ) == 1
+
+    def test_02_parallel_duplicate_signups(self, monkeypatch):
+        # Одна группа делит username, другая - email; в каждой
+        # должен появиться ровно один пользователь.
+        requests = [
+            {'email': 'alpha@yamdb.fake', 'username': 'alpha'},
+            {'email': 'alpha@yamdb.fake', 'username': 'alpha'},
+        ] + [
+            {'email': f'alpha{number}@yamdb.fake', 'username': 'alpha'}
+            for number in range(5)
+        ] + [
+            {'email': 'beta@yamdb.fake', 'username': 'beta'},
+            {'email': 'beta@yamdb.fake', 'username': 'beta'},
+        ] + [
+            {'email': 'beta@yamdb.fake', 'username': f'beta{number}'}
+            for number in range(5)
+        ]
+        # Все запросы проходят проверку до первой вставки, так что
+        # дубликаты отсекаются только ограничениями уникальности.
+        barrier = Barrier(len(requests))
+        validate = SignUpSerializer.validate
+
+        def validate_together(serializer, data):
+            data = validate(serializer, data)
+            barrier.wait(timeout=10)
+            return data
+
+        monkeypatch.setattr(SignUpSerializer, 'validate', validate_together)
+        # Ограничения частоты отсекли бы часть запросов до проверки.
+        monkeypatch.setattr(SignUpView, 'throttle_classes', ())
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            statuses = list(executor.map(signup, requests))
+        assert set(statuses) <= {HTTPStatus.OK, HTTPStatus.BAD_REQUEST}, (
+            'Проверьте, что параллельные регистрации с одинаковыми email '
+            f'или username не приводят к ошибке сервера: {statuses}'
+        )
+        users = list(User.objects.values('email', 'username'))
+        assert len(users) == 2, (
+            'Проверьте, что параллельные регистрации с одним email или '
+            'username создают одного пользователя.'
+        )
+        expected_ok = sum(data in users for data in requests)
+        assert statuses.count(HTTPStatus.OK) == expected_ok, (
+            'Проверьте, что успешно завершаются только регистрации с '
+            f'данными созданного пользователя: {statuses}'
+        )
+        assert QueuedEmail.objects.count() == expected_ok
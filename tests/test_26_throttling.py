@@ -0,0 +1,142 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+from types import SimpleNamespace
+
+import pytest
+from api import throttling
+from django.core.cache.backends.filebased import FileBasedCache
+from rest_framework.test import APIRequestFactory
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+URL_TOKEN = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates
+        }
+    return set_rates
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Throttling:
+
+    def test_01_signup_per_username(self, client, rates):
+        rates(signup_ip='100/min', signup_username='2/min')
+        for number in range(2):
+            response = client.post(URL_SIGNUP, data={
+                'email': f'flood{number}@yamdb.fake', 'username': 'Flood'
+            })
+            assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+        response = client.post(URL_SIGNUP, data={
+            'email': 'flood@yamdb.fake', 'username': 'flood'
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что запросы к `{URL_SIGNUP}` ограничиваются '
+            'по username без учёта регистра.'
+        )
+        assert 0 < int(response['Retry-After']) <= 30
+        response = client.post(URL_SIGNUP, data={
+            'email': 'other@yamdb.fake', 'username': 'other'
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_token_per_ip_with_refill(self, client, rates, monkeypatch):
+        rates(token_ip='3/min', token_username='100/min')
+        now = 1000.0
+        monkeypatch.setattr(
+            throttling, 'time', SimpleNamespace(time=lambda: now)
+        )
+        data = {'confirmation_code': 'wrong'}
+        for number in range(3):
+            response = client.post(
+                URL_TOKEN, data={**data, 'username': f'guess{number}'}
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.post(URL_TOKEN, data={**data, 'username': 'next'})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что запросы к `{URL_TOKEN}` ограничиваются по '
+            'IP-адресу.'
+        )
+        response = client.post(
+            URL_TOKEN, data={**data, 'username': 'next'},
+            REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        now += 20
+        response = client.post(URL_TOKEN, data={**data, 'username': 'next'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что ведро пополняется со временем.'
+        )
+        response = client.post(URL_TOKEN, data={**data, 'username': 'next'})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_03_role_quotas(self, rates, admin_client, user_client):
+        rates(role_user='2/min', role_admin=None)
+        for _ in range(2):
+            assert user_client.get('/api/v1/users/me/').status_code == (
+                HTTPStatus.OK
+            )
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что квота роли user ограничивает её запросы.'
+        )
+        for _ in range(5):
+            assert admin_client.get('/api/v1/users/me/').status_code == (
+                HTTPStatus.OK
+            )
+
+    def test_04_spoofed_forwarded_for(self, client, rates):
+        rates(signup_ip='2/min', signup_username='100/min')
+        for number in range(3):
+            response = client.post(URL_SIGNUP, data={
+                'email': f'spoof{number}@yamdb.fake',
+                'username': f'spoof{number}'
+            }, HTTP_X_FORWARDED_FOR=f'10.1.0.{number}')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что лимит запросов к `{URL_SIGNUP}` по IP-адресу '
+            'нельзя обойти подменой заголовка X-Forwarded-For.'
+        )
+
+    @pytest.mark.parametrize('url', (URL_SIGNUP, URL_TOKEN))
+    def test_05_body_without_fields(self, client, url):
+        response = client.post(
+            url, data=[1], content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{url}` со списком в теле '
+            'возвращает статус 400.'
+        )
+
+    def test_06_concurrent_requests(self, rates, monkeypatch):
+        rates(signup_ip='5/min')
+        get = FileBasedCache.get
+
+        def slow_get(cache, *args, **kwargs):
+            # Между чтением и записью ведра успевают прийти другие запросы.
+            value = get(cache, *args, **kwargs)
+            time.sleep(0.02)
+            return value
+
+        monkeypatch.setattr(FileBasedCache, 'get', slow_get)
+        request = APIRequestFactory().post(URL_SIGNUP)
+        view = SimpleNamespace(throttle_scope='signup')
+        barrier = Barrier(20)
+
+        def attempt(_):
+            barrier.wait()
+            return throttling.IPTokenBucketThrottle().allow_request(
+                request, view
+            )
+
+        with ThreadPoolExecutor(20) as executor:
+            allowed = sum(executor.map(attempt, range(20)))
+        assert allowed == 5, (
+            'Проверьте, что параллельные запросы не превышают лимит: '
+            f'пропущено {allowed} запросов из 20 при лимите 5.'
+        )
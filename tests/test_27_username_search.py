@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from users.models import User
+
+USERS_URL = '/api/v1/users/'
+AUTOCOMPLETE_URL = '/api/v1/users/autocomplete/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27UsernameSearch:
+
+    @pytest.fixture
+    def users(self):
+        usernames = ['Testing', 'tester', 'TEST_3', 'atest', 'other', 'Жук']
+        User.objects.bulk_create(
+            User(username=username, email=f'user{number}@yamdb.fake')
+            for number, username in enumerate(usernames)
+        )
+
+    def test_01_prefix_search(self, admin_client, users):
+        response = admin_client.get(USERS_URL, {'search': 'tEsT'})
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            user['username'] for user in response.json()['results']
+        ] == ['TEST_3', 'TestAdmin', 'tester', 'Testing'], (
+            f'Проверьте, что `{USERS_URL}?search=` ищет пользователей по '
+            'началу username без учёта регистра.'
+        )
+
+    def test_02_autocomplete(self, admin_client, user_client, users):
+        response = admin_client.get(
+            AUTOCOMPLETE_URL, {'q': 'test', 'limit': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == ['TEST_3', 'TestAdmin'], (
+            f'Проверьте, что `{AUTOCOMPLETE_URL}` возвращает первые по '
+            'алфавиту username с заданным началом.'
+        )
+        assert admin_client.get(AUTOCOMPLETE_URL, {'q': 'Жу'}).json() == [
+            'Жук'
+        ]
+        assert admin_client.get(AUTOCOMPLETE_URL).json() == []
+        response = admin_client.get(AUTOCOMPLETE_URL, {'q': 't', 'limit': 'x'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = user_client.get(AUTOCOMPLETE_URL, {'q': 'test'})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_index_range_scan(self, admin_client, users):
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get(AUTOCOMPLETE_URL, {'q': 'test'})
+        sql = context.captured_queries[-1]['sql']
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        assert 'user_username_lower_idx' in plan, (
+            'Проверьте, что поиск по началу username использует индекс '
+            f'user_username_lower_idx. План запроса: {plan}'
+        )
+        assert 'SCAN' not in plan and 'TEMP B-TREE' not in plan, (
+            'Проверьте, что поиск читает диапазон индекса без перебора '
+            f'таблицы и сортировки. План запроса: {plan}'
+        )